@@ -1,6 +1,9 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import html
 import streamlit.components.v1 as components
 import plotly.graph_objects as go
 import pandas as pd
@@ -18,6 +21,8 @@ st.set_page_config(
 # Load environment variables for configurable API endpoints
 load_dotenv()
 API_BASE_URL = os.getenv("API_BASE_URL", "https://chaincompass-ai-krishnav.onrender.com")
+# How long an identical quote request is answered from the Streamlit cache (seconds)
+FRONTEND_QUOTE_CACHE_TTL = int(os.getenv("FRONTEND_QUOTE_CACHE_TTL", "30"))
 
 # --- Asset & Style Management ---
 @st.cache_data
@@ -52,460 +57,118 @@ def get_logo_as_html(width="100%"):
         style += f" width: {width};"
     return f'<div style="{style}">{logo_svg}</div>'
 
+# The stylesheet lives in static/app.css and is served by Streamlit's static file server
+# (enableStaticServing in .streamlit/config.toml), so the browser caches it. Streamlit serves .css
+# as text/plain with nosniff, which a <link rel="stylesheet"> would reject, so the loader fetches it
+# and inserts it into the page's <head> once per tab; the style element survives reruns.
+STYLE_LOADER = """
+<script>
+    const doc = window.parent.document;
+    if (!doc.getElementById("chaincompass-css")) {
+        const style = doc.createElement("style");
+        style.id = "chaincompass-css";
+        doc.head.appendChild(style);
+        fetch(new URL("app/static/app.css", window.parent.location.href))
+            .then((response) => response.ok ? response.text() : Promise.reject(response.status))
+            .then((css) => { style.textContent = css; })
+            .catch(() => style.remove());
+    }
+</script>
+"""
+
 def apply_custom_styling():
-    """Injects all custom CSS for the entire multi-page application."""
-    custom_css = """
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
-    @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600&display=swap');
-    
-    :root {
-        --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        --secondary-gradient: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        --accent-gradient: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        --dark-bg: #0a0a0f;
-        --card-bg: rgba(255, 255, 255, 0.05);
-        --card-border: rgba(255, 255, 255, 0.1);
-        --text-primary: #ffffff;
-        --text-secondary: rgba(255, 255, 255, 0.7);
-        --text-accent: #00f2fe;
-        --shadow-glow: 0 0 20px rgba(102, 126, 234, 0.3);
-        --shadow-card: 0 8px 32px rgba(0, 0, 0, 0.3);
-    }
-    
-    * { box-sizing: border-box; }
-    
-    body { 
-        font-family: 'Inter', sans-serif; 
-        background: var(--dark-bg);
-        margin: 0;
-        padding: 0;
-        overflow-x: hidden;
-    }
-    
-    /* Animated background */
-    .main-container {
-        position: relative;
-        min-height: 100vh;
-        background: radial-gradient(ellipse at top, #1a1a2e 0%, #16213e 50%, #0a0a0f 100%);
-        overflow: hidden;
-    }
-    
-    .main-container::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        background: 
-            radial-gradient(circle at 20% 80%, rgba(120, 119, 198, 0.3) 0%, transparent 50%),
-            radial-gradient(circle at 80% 20%, rgba(255, 119, 198, 0.3) 0%, transparent 50%),
-            radial-gradient(circle at 40% 40%, rgba(120, 219, 255, 0.2) 0%, transparent 50%);
-        animation: backgroundShift 20s ease-in-out infinite;
-        z-index: -1;
-    }
-    
-    @keyframes backgroundShift {
-        0%, 100% { transform: translateX(0) translateY(0) scale(1); }
-        33% { transform: translateX(-20px) translateY(-10px) scale(1.05); }
-        66% { transform: translateX(20px) translateY(10px) scale(0.95); }
-    }
-    
-    /* Floating particles */
-    .particles {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        pointer-events: none;
-        z-index: -1;
-    }
-    
-    .particle {
-        position: absolute;
-        width: 2px;
-        height: 2px;
-        background: var(--text-accent);
-        border-radius: 50%;
-        animation: float 6s ease-in-out infinite;
-    }
-    
-    @keyframes float {
-        0%, 100% { transform: translateY(0px) translateX(0px); opacity: 0; }
-        10%, 90% { opacity: 1; }
-        50% { transform: translateY(-100px) translateX(50px); }
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: rgba(10, 10, 15, 0.8) !important;
-        backdrop-filter: blur(20px) !important;
-        border-right: 1px solid var(--card-border) !important;
-        box-shadow: var(--shadow-card) !important;
-    }
-    
-    [data-testid="stSidebar"] .stMarkdown {
-        padding: 1rem 0;
-    }
-    
-    /* Navigation buttons */
-    .nav-button {
-        background: transparent !important;
-        color: var(--text-primary) !important;
-        border: 1px solid var(--card-border) !important;
-        border-radius: 12px !important;
-        padding: 12px 20px !important;
-        margin: 8px 0 !important;
-        font-weight: 500 !important;
-        font-size: 14px !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-        text-align: left !important;
-        width: 100% !important;
-    }
-    
-    .nav-button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: var(--primary-gradient);
-        transition: left 0.3s ease;
-        z-index: -1;
-    }
-    
-    .nav-button:hover {
-        color: white !important;
-        border-color: transparent !important;
-        transform: translateX(8px) !important;
-        box-shadow: var(--shadow-glow) !important;
-    }
-    
-    .nav-button:hover::before {
-        left: 0;
-    }
-    
-    .nav-button.active {
-        background: var(--primary-gradient) !important;
-        color: white !important;
-        border-color: transparent !important;
-        box-shadow: var(--shadow-glow) !important;
-    }
-    
-    /* Main content area */
-    .main-content {
-        padding: 2rem;
-        max-width: 1400px;
-        margin: 0 auto;
-    }
-    
-    /* Headers */
-    h1 {
-        font-weight: 800 !important;
-        font-size: 3rem !important;
-        background: var(--primary-gradient) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-        background-clip: text !important;
-        margin: 0 0 1rem 0 !important;
-        display: flex !important;
-        align-items: center !important;
-        animation: titleGlow 3s ease-in-out infinite alternate !important;
-    }
-    
-    @keyframes titleGlow {
-        from { filter: drop-shadow(0 0 10px rgba(102, 126, 234, 0.5)); }
-        to { filter: drop-shadow(0 0 20px rgba(102, 126, 234, 0.8)); }
-    }
-    
-    h1 svg {
-        width: 48px !important;
-        height: 48px !important;
-        margin-right: 20px !important;
-        fill: url(#primaryGradient) !important;
-        animation: iconPulse 2s ease-in-out infinite !important;
-    }
-    
-    @keyframes iconPulse {
-        0%, 100% { transform: scale(1); }
-        50% { transform: scale(1.1); }
-    }
-    
-    h2 {
-        font-weight: 700 !important;
-        color: var(--text-primary) !important;
-        margin: 2rem 0 1rem 0 !important;
-        font-size: 2rem !important;
-    }
-    
-    h3 {
-        font-weight: 600 !important;
-        color: var(--text-primary) !important;
-        margin: 1.5rem 0 0.5rem 0 !important;
-        font-size: 1.5rem !important;
-    }
-    
-    /* Cards */
-    .glass-card {
-        background: var(--card-bg) !important;
-        backdrop-filter: blur(20px) !important;
-        border: 1px solid var(--card-border) !important;
-        border-radius: 20px !important;
-        padding: 2rem !important;
-        box-shadow: var(--shadow-card) !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-        animation: cardSlideIn 0.6s ease-out !important;
-    }
-    
-    @keyframes cardSlideIn {
-        from { opacity: 0; transform: translateY(30px) scale(0.95); }
-        to { opacity: 1; transform: translateY(0) scale(1); }
-    }
-    
-    .glass-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 1px;
-        background: var(--primary-gradient);
-        opacity: 0.6;
-    }
-    
-    .glass-card:hover {
-        transform: translateY(-5px) !important;
-        box-shadow: 0 20px 40px rgba(0, 0, 0, 0.4) !important;
-        border-color: rgba(102, 126, 234, 0.3) !important;
-    }
-    
-    /* Metric cards */
-    .metric-card {
-        background: var(--card-bg) !important;
-        backdrop-filter: blur(20px) !important;
-        border: 1px solid var(--card-border) !important;
-        border-radius: 16px !important;
-        padding: 1.5rem !important;
-        text-align: center !important;
-        transition: all 0.3s ease !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-    
-    .metric-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: var(--primary-gradient);
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-8px) !important;
-        box-shadow: var(--shadow-glow) !important;
-    }
-    
-    .metric-card h4 {
-        color: var(--text-secondary) !important;
-        font-size: 0.9rem !important;
-        font-weight: 500 !important;
-        margin: 0 0 0.5rem 0 !important;
-        text-transform: uppercase !important;
-        letter-spacing: 0.5px !important;
-    }
-    
-    .metric-card h2 {
-        color: var(--text-primary) !important;
-        font-size: 2.5rem !important;
-        font-weight: 800 !important;
-        margin: 0 0 0.5rem 0 !important;
-        background: var(--primary-gradient) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-    }
-    
-    .metric-card p {
-        color: var(--text-secondary) !important;
-        font-size: 0.85rem !important;
-        margin: 0 !important;
-    }
-    
-    /* Form elements */
-    [data-testid="stSelectbox"] > div > div,
-    [data-testid="stNumberInput"] > div > div {
-        background: var(--card-bg) !important;
-        border: 1px solid var(--card-border) !important;
-        border-radius: 12px !important;
-        color: var(--text-primary) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    [data-testid="stSelectbox"] > div > div:focus-within,
-    [data-testid="stNumberInput"] > div > div:focus-within {
-        border-color: #667eea !important;
-        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1) !important;
-    }
-    
-    /* Primary buttons */
-    .stButton > button[kind="primary"] {
-        background: var(--primary-gradient) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 12px !important;
-        padding: 12px 24px !important;
-        font-weight: 600 !important;
-        font-size: 16px !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        position: relative !important;
-        overflow: hidden !important;
-        text-transform: none !important;
-    }
-    
-    .stButton > button[kind="primary"]:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: var(--shadow-glow) !important;
-    }
-    
-    .stButton > button[kind="primary"]:active {
-        transform: translateY(0) !important;
-    }
-    
-    /* Loading spinner */
-    .loading-spinner {
-        display: inline-block;
-        width: 20px;
-        height: 20px;
-        border: 3px solid rgba(255, 255, 255, 0.3);
-        border-radius: 50%;
-        border-top-color: var(--text-accent);
-        animation: spin 1s ease-in-out infinite;
-        margin-right: 10px;
-    }
-    
-    @keyframes spin {
-        to { transform: rotate(360deg); }
-    }
-    
-    /* Success/Error states */
-    .success-card {
-        background: linear-gradient(135deg, rgba(34, 197, 94, 0.1) 0%, rgba(34, 197, 94, 0.05) 100%) !important;
-        border: 1px solid rgba(34, 197, 94, 0.3) !important;
-    }
-    
-    .error-card {
-        background: linear-gradient(135deg, rgba(239, 68, 68, 0.1) 0%, rgba(239, 68, 68, 0.05) 100%) !important;
-        border: 1px solid rgba(239, 68, 68, 0.3) !important;
-    }
-    
-    /* Tech badges */
-    .tech-badges img {
-        margin: 8px !important;
-        transition: all 0.3s ease !important;
-        border-radius: 8px !important;
-        filter: grayscale(0.3) !important;
-    }
-    
-    .tech-badges img:hover {
-        transform: scale(1.1) translateY(-2px) !important;
-        filter: grayscale(0) !important;
-        box-shadow: 0 8px 25px rgba(0, 0, 0, 0.3) !important;
-    }
-    
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .main-content {
-            padding: 1rem;
-        }
-        
-        h1 {
-            font-size: 2rem !important;
-        }
-        
-        h1 svg {
-            width: 32px !important;
-            height: 32px !important;
-        }
-        
-        .glass-card {
-            padding: 1.5rem !important;
-        }
-        
-        .metric-card h2 {
-            font-size: 2rem !important;
-        }
-    }
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.1);
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: var(--primary-gradient);
-        border-radius: 4px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: var(--secondary-gradient);
-    }
-    
-    /* Animation delays for staggered effects */
-    .glass-card:nth-child(1) { animation-delay: 0.1s; }
-    .glass-card:nth-child(2) { animation-delay: 0.2s; }
-    .glass-card:nth-child(3) { animation-delay: 0.3s; }
-    .glass-card:nth-child(4) { animation-delay: 0.4s; }
-    """
-    st.markdown(f"<style>{custom_css}</style>", unsafe_allow_html=True)
+    """Loads the custom CSS for the entire multi-page application (see STYLE_LOADER)."""
+    # The loader is identical on every rerun, so the frontend keeps its iframe instead of reloading it.
+    components.html(STYLE_LOADER, height=0)
 
 # --- Caching Data Generation Functions ---
-@st.cache_data
-def generate_volume_chart():
-    df_chains = pd.DataFrame({'Chain': ['Polygon', 'Arbitrum', 'Optimism', 'Base', 'Ethereum'],'Volume (Millions)': [450, 320, 210, 150, 90]})
-    fig = go.Figure(data=[go.Bar(x=df_chains['Chain'], y=df_chains['Volume (Millions)'], marker_color=['#A770EF', '#CF8BF3', '#FDB99B', '#A770EF', '#CF8BF3'])])
+CHAIN_NAMES = {"POL": "Polygon", "ARB": "Arbitrum", "ETH": "Ethereum", "OPT": "Optimism", "BASE": "Base"}
+CHART_COLORS = ['#A770EF', '#CF8BF3', '#FDB99B', '#8A2BE2', '#4B0082']
+EMPTY_WINDOW = {"count": 0, "volume_usd": 0.0, "avg_time_seconds": None, "chain": {}, "token": {}, "provider": {}}
+
+def format_usd(value):
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if value >= threshold:
+            return f"${value / threshold:.1f}{suffix}"
+    return f"${value:,.0f}"
+
+def generate_volume_chart(chain_volumes):
+    """Bar chart of USD volume per chain; chain_volumes maps chain code to [count, volume_usd]."""
+    chains = sorted(chain_volumes.items(), key=lambda item: item[1][1], reverse=True)
+    df_chains = pd.DataFrame({'Chain': [CHAIN_NAMES.get(code, code) for code, _ in chains], 'Volume (USD)': [volume for _, (_, volume) in chains]})
+    fig = go.Figure(data=[go.Bar(x=df_chains['Chain'], y=df_chains['Volume (USD)'], marker_color=[CHART_COLORS[i % len(CHART_COLORS)] for i in range(len(chains))])])
     fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_color="white", margin=dict(l=20, r=20, t=20, b=20))
     return fig
 
-@st.cache_data
-def generate_token_pie_chart():
-    df_tokens = pd.DataFrame({'Token': ['USDC', 'ETH', 'USDT', 'WBTC', 'Other'], 'Percentage': [55, 25, 12, 5, 3]})
-    fig = go.Figure(data=[go.Pie(labels=df_tokens['Token'], values=df_tokens['Percentage'], hole=.4, marker_colors=['#A770EF', '#CF8BF3', '#FDB99B', '#8A2BE2', '#4B0082'])])
+def generate_token_pie_chart(token_counts):
+    """Share of served quotes per source token; token_counts maps symbol to [count, volume_usd]."""
+    df_tokens = pd.DataFrame({'Token': list(token_counts), 'Quotes': [count for count, _ in token_counts.values()]})
+    fig = go.Figure(data=[go.Pie(labels=df_tokens['Token'], values=df_tokens['Quotes'], hole=.4, marker_colors=CHART_COLORS)])
     fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_color="white", legend_orientation="h", margin=dict(l=20, r=20, t=20, b=20))
     return fig
 
+# --- Backend API Access ---
+@st.cache_resource
+def get_http_session():
+    """One keep-alive session per server process, shared by all reruns and users."""
+    session = requests.Session()
+    # Only retry failures that mean the request never reached a working backend: connection errors
+    # and 502 from the proxy. A 503 is the backend's circuit breaker failing fast (its Retry-After
+    # would stall the click), and a 504 already includes the backend's own retries or LLM timeout.
+    retries = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(502,),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_data(ttl=FRONTEND_QUOTE_CACHE_TTL, show_spinner=False)
+def fetch_quote(from_chain, to_chain, from_token, to_token, from_amount):
+    """
+    Quote from the backend, cached per request parameters for FRONTEND_QUOTE_CACHE_TTL seconds.
+    Errors raise (requests exceptions) and are therefore not cached.
+    """
+    params = {
+        "fromChain": from_chain,
+        "toChain": to_chain,
+        "fromToken": from_token,
+        "toToken": to_token,
+        "fromAmount": from_amount,
+    }
+    response = get_http_session().get(f"{API_BASE_URL.rstrip('/')}/api/v1/quote", params=params, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def fetch_stats():
+    """Served-quote rollups from the backend's /api/v1/stats, or None if it is unreachable."""
+    try:
+        response = get_http_session().get(f"{API_BASE_URL.rstrip('/')}/api/v1/stats", timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except Exception:
+        return None
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_token_decimals(chain_code, token_code, fallback):
+    """Token decimals from the backend's token index, or the built-in value if unavailable."""
+    try:
+        response = get_http_session().get(f"{API_BASE_URL.rstrip('/')}/api/v1/tokens/{chain_code}/{token_code}", timeout=5)
+        response.raise_for_status()
+        return int(response.json()["decimals"])
+    except Exception:
+        return fallback
+
 # --- Page Rendering Functions ---
 def render_dashboard():
-    # Add floating particles effect
-    st.markdown("""
-    <div class="particles" id="particles"></div>
-    <script>
-        function createParticles() {
-            const container = document.getElementById('particles');
-            for (let i = 0; i < 50; i++) {
-                const particle = document.createElement('div');
-                particle.className = 'particle';
-                particle.style.left = Math.random() * 100 + '%';
-                particle.style.top = Math.random() * 100 + '%';
-                particle.style.animationDelay = Math.random() * 6 + 's';
-                particle.style.animationDuration = (Math.random() * 4 + 4) + 's';
-                container.appendChild(particle);
-            }
-        }
-        createParticles();
-    </script>
-    """, unsafe_allow_html=True)
-    
     st.markdown("""
     <h1>
         <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="currentColor" width="48" height="48">
@@ -529,40 +192,47 @@ def render_dashboard():
     </div>
     """, unsafe_allow_html=True)
     
+    stats = fetch_stats()
+    day = stats["windows"]["24h"] if stats else EMPTY_WINDOW
+    hour = stats["windows"]["1h"] if stats else EMPTY_WINDOW
+    if stats is None:
+        st.warning("Live statistics are unavailable right now: the backend could not be reached.")
+
     st.markdown("### 📊 Key Metrics")
     
     # Enhanced metrics with better styling
     m1, m2, m3, m4 = st.columns(4)
+    avg_time = f"{day['avg_time_seconds']:.0f}s" if day["avg_time_seconds"] is not None else "–"
     with m1: 
-        st.markdown('''
+        st.markdown(f'''
         <div class="metric-card">
-            <h4>Total Value Swapped</h4>
-            <h2>$1.2B</h2>
-            <p style="color: #22c55e;">+2.5% last 24h</p>
+            <h4>Value Quoted (24h)</h4>
+            <h2>{format_usd(day["volume_usd"])}</h2>
+            <p style="color: #22c55e;">{format_usd(hour["volume_usd"])} last hour</p>
         </div>
         ''', unsafe_allow_html=True)
     with m2: 
-        st.markdown('''
+        st.markdown(f'''
         <div class="metric-card">
-            <h4>Transactions (24h)</h4>
-            <h2>15,203</h2>
-            <p style="color: #ef4444;">-1.8% vs yesterday</p>
+            <h4>Quotes (24h)</h4>
+            <h2>{day["count"]:,}</h2>
+            <p style="color: #22c55e;">{hour["count"]:,} in the last hour</p>
         </div>
         ''', unsafe_allow_html=True)
     with m3: 
-        st.markdown('''
+        st.markdown(f'''
         <div class="metric-card">
-            <h4>Avg. Swap Time</h4>
-            <h2>85s</h2>
-            <p style="color: #22c55e;">-12% faster</p>
+            <h4>Avg. Route Time</h4>
+            <h2>{avg_time}</h2>
+            <p style="color: var(--text-accent);">across quoted routes</p>
         </div>
         ''', unsafe_allow_html=True)
     with m4: 
-        st.markdown('''
+        st.markdown(f'''
         <div class="metric-card">
-            <h4>Supported Chains</h4>
-            <h2>12</h2>
-            <p style="color: var(--text-accent);">+2 new integrations</p>
+            <h4>Active Chains (24h)</h4>
+            <h2>{len(day["chain"])}</h2>
+            <p style="color: var(--text-accent);">{len(day["provider"])} providers used</p>
         </div>
         ''', unsafe_allow_html=True)
     
@@ -571,46 +241,42 @@ def render_dashboard():
     c1, c2 = st.columns(2)
     with c1:
         st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("#### 🔗 Swap Volume by Chain")
-        st.plotly_chart(generate_volume_chart(), use_container_width=True)
+        st.markdown("#### 🔗 Quoted Volume by Chain (24h)")
+        if day["chain"]:
+            st.plotly_chart(generate_volume_chart(day["chain"]), use_container_width=True)
+        else:
+            st.info("No quotes served in the last 24 hours yet.")
         st.markdown('</div>', unsafe_allow_html=True)
     with c2:
         st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-        st.markdown("#### 🪙 Popular Token Swaps")
-        st.plotly_chart(generate_token_pie_chart(), use_container_width=True)
+        st.markdown("#### 🪙 Popular Token Swaps (24h)")
+        if day["token"]:
+            st.plotly_chart(generate_token_pie_chart(day["token"]), use_container_width=True)
+        else:
+            st.info("No quotes served in the last 24 hours yet.")
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Add real-time activity section
     st.markdown("### ⚡ Live Activity Feed")
     st.markdown('<div class="glass-card">', unsafe_allow_html=True)
     
-    # Simulate real-time data
-    import random
-    from datetime import datetime, timedelta
+    from datetime import datetime
     
-    activity_data = []
-    for i in range(5):
-        chains = ['Polygon', 'Arbitrum', 'Optimism', 'Base', 'Ethereum']
-        tokens = ['USDC', 'ETH', 'USDT', 'WBTC']
-        amounts = ['$1,250', '$5,600', '$890', '$12,400', '$3,200']
-        
-        activity_data.append({
-            'time': (datetime.now() - timedelta(minutes=random.randint(1, 30))).strftime('%H:%M'),
-            'chain': random.choice(chains),
-            'token': random.choice(tokens),
-            'amount': random.choice(amounts),
-            'status': 'Completed'
-        })
-    
-    for activity in activity_data:
+    # Most recent quotes first: [time, chain, token, provider, volume_usd]
+    recent = list(reversed(stats["recent"][-5:])) if stats else []
+    if not recent:
+        st.markdown('<p style="color: var(--text-secondary); margin: 0;">No recent quotes.</p>', unsafe_allow_html=True)
+    for served_at, chain, token, provider, volume_usd in recent:
+        # Chain, token and provider come from other users' requests: escape before rendering as HTML.
+        chain, token, provider = (html.escape(str(v)) for v in (CHAIN_NAMES.get(chain, chain), token, provider))
         st.markdown(f"""
         <div style="display: flex; justify-content: space-between; align-items: center; padding: 0.75rem; margin: 0.5rem 0; background: rgba(255, 255, 255, 0.03); border-radius: 8px; border-left: 3px solid var(--text-accent);">
             <div>
-                <strong>{activity['amount']}</strong> {activity['token']} on <strong>{activity['chain']}</strong>
+                <strong>${volume_usd:,.0f}</strong> {token} on <strong>{chain}</strong>
             </div>
             <div style="display: flex; align-items: center; gap: 1rem;">
-                <span style="color: var(--text-secondary); font-size: 0.9rem;">{activity['time']}</span>
-                <span style="color: #22c55e; font-size: 0.8rem; background: rgba(34, 197, 94, 0.1); padding: 0.25rem 0.5rem; border-radius: 4px;">{activity['status']}</span>
+                <span style="color: var(--text-secondary); font-size: 0.9rem;">{datetime.fromtimestamp(served_at).strftime('%H:%M')}</span>
+                <span style="color: #22c55e; font-size: 0.8rem; background: rgba(34, 197, 94, 0.1); padding: 0.25rem 0.5rem; border-radius: 4px;">{provider}</span>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -736,22 +402,20 @@ def render_swap_ai():
         
         # Show loading animation
         with st.spinner("🔍 Analyzing routes across multiple DEXs and bridges..."):
-            api_url = f"{API_BASE_URL.rstrip('/')}/api/v1/quote"
-            decimals = TOKENS[from_token_name]["decimals"]
-            params = { 
-                "fromChain": CHAINS[from_chain_name]["code"], 
-                "toChain": CHAINS[to_chain_name]["code"], 
-                "fromToken": TOKENS[from_token_name]["code"], 
-                "toToken": TOKENS[to_token_name]["code"], 
-                "fromAmount": str(int(from_amount_display * (10**decimals))) 
-            }
-            
+            decimals = get_token_decimals(
+                CHAINS[from_chain_name]["code"], TOKENS[from_token_name]["code"], TOKENS[from_token_name]["decimals"]
+            )
             try:
-                response = requests.get(api_url, params=params, timeout=60)
-                response.raise_for_status()
-                st.session_state.result = response.json()
+                st.session_state.result = fetch_quote(
+                    CHAINS[from_chain_name]["code"],
+                    CHAINS[to_chain_name]["code"],
+                    TOKENS[from_token_name]["code"],
+                    TOKENS[to_token_name]["code"],
+                    str(int(from_amount_display * (10**decimals))),
+                )
                 st.session_state.loading = False
             except requests.exceptions.HTTPError as http_err:
+                response = http_err.response
                 try:
                     err_json = response.json()
                 except Exception:
@@ -892,8 +556,6 @@ def render_about_page():
 
 # --- Main App Router ---
 def main():
-    apply_custom_styling()
-    
     with st.sidebar:
         st.markdown(get_logo_as_html(), unsafe_allow_html=True)
         st.markdown("### Navigation")
@@ -944,23 +606,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        # JavaScript for enhanced interactions
-        components.html(f"""
-            <script>
-                // Add hover effects to navigation buttons
-                var navButtons = parent.document.querySelectorAll('[data-testid="stSidebar"] button');
-                navButtons.forEach(function(button) {{
-                    button.addEventListener('mouseenter', function() {{
-                        this.style.transform = 'translateX(8px)';
-                        this.style.boxShadow = '0 0 20px rgba(102, 126, 234, 0.3)';
-                    }});
-                    button.addEventListener('mouseleave', function() {{
-                        this.style.transform = 'translateX(0)';
-                        this.style.boxShadow = 'none';
-                    }});
-                }});
-            </script>
-        """, height=0)
+        apply_custom_styling()
 
     # Render the active page
     page_functions = {"Dashboard": render_dashboard, "Swap AI": render_swap_ai, "About": render_about_page}
@@ -0,0 +1,63 @@
+"""
+Approximate quote reuse (QUOTE_APPROX_TOLERANCE) on one hot pair.
+
+Sends REQUESTS quotes for random fromAmounts of a single pair through the app, so quote_cache
+keeps evicting that pair's amounts, and checks that the pair's amount_index list stays within
+QUOTE_CACHE_SIZE. Reports the cache statuses, the index size and the cost of one
+find_approximate() lookup.
+
+Run from the repository root:  python -m benchmarks.bench_approx_quotes
+"""
+import asyncio
+import os
+import random
+import time
+from collections import Counter
+
+# main reads its configuration at import.
+os.environ["QUOTE_APPROX_TOLERANCE"] = "0.001"
+os.environ["QUOTE_CACHE_SIZE"] = "100"
+
+from benchmarks.loadtest import BASE_PARAMS, drive, install_fakes
+
+import main
+
+REQUESTS = 5000
+CONCURRENCY = 16
+LOOKUPS = 10000
+
+
+async def amain() -> None:
+    install_fakes(upstream_latency_s=0.001, llm_latency_s=0.0)
+    rng = random.Random(0)
+    amounts = [str(rng.randrange(100_000_000, 200_000_000)) for _ in range(REQUESTS)]
+    requests = [{**BASE_PARAMS, "fromAmount": amount} for amount in amounts]
+
+    statuses = Counter()
+    sizes = []
+    for start in range(0, REQUESTS, 500):
+        before = dict(main.quote_cache_events.values)
+        r = await drive(requests[start:start + 500], CONCURRENCY)
+        assert not r["errors"], r
+        for (status,), count in main.quote_cache_events.values.items():
+            statuses[status] += int(count - before.get((status,), 0))
+        sizes.append(max(len(a) for a in main.amount_index.values()))
+
+    req = main.QuoteRequest(**requests[0])
+    started = time.perf_counter()
+    for _ in range(LOOKUPS):
+        main.find_approximate(req)
+    lookup_us = (time.perf_counter() - started) / LOOKUPS * 1e6
+
+    print(
+        f"{REQUESTS} requests on one pair, tolerance {main.QUOTE_APPROX_TOLERANCE:g},"
+        f" QUOTE_CACHE_SIZE {main.QUOTE_CACHE_SIZE}"
+    )
+    print(f"cache statuses: {dict(statuses)}")
+    print(f"quote_cache entries: {len(main.quote_cache)}, pair amounts per 500 requests: {sizes}")
+    print(f"find_approximate: {lookup_us:.2f} µs")
+    assert max(sizes) <= main.QUOTE_CACHE_SIZE, sizes
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
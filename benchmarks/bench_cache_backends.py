@@ -0,0 +1,80 @@
+"""
+Compare quote-cache hit ratios of the per-process memory backend and the shared SQLite
+backend when requests are spread over 1, 4 and 8 worker processes.
+
+Run from the repository root:  python -m benchmarks.bench_cache_backends
+"""
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import time
+
+from cache_backends import make_cache
+
+CHAINS = ["ETH", "POL", "ARB", "OPT", "BAS"]
+TOKENS = ["USDC", "USDT", "ETH", "DAI"]
+AMOUNTS = ["50000000", "100000000", "500000000", "1000000000", "5000000000"]
+
+RATE = 400          # total requests per second across all workers
+DURATION = 4.0      # seconds of simulated traffic
+TTL = 1.0           # cache TTL in seconds (scaled down from 60s so the run stays short)
+MAXSIZE = 1000
+
+
+def request_stream(seed: int = 42) -> list:
+    """A Zipf-like request mix: a few popular pairs and a long tail."""
+    rng = random.Random(seed)
+    keys = [
+        (fc, tc, ft, tt, amount, None)
+        for fc in CHAINS for tc in CHAINS if fc != tc
+        for ft in TOKENS for tt in TOKENS
+        for amount in AMOUNTS
+    ]
+    rng.shuffle(keys)
+    weights = [1 / (rank + 1) for rank in range(len(keys))]
+    return rng.choices(keys, weights=weights, k=int(RATE * DURATION))
+
+
+def worker(worker_id: int, workers: int, backend: str, path: str, start: float, results) -> None:
+    cache = make_cache(backend, maxsize=MAXSIZE, ttl=TTL, path=path)
+    hits = total = 0
+    for i, key in enumerate(request_stream()):
+        if i % workers != worker_id:
+            continue
+        delay = start + i / RATE - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        total += 1
+        if key in cache:
+            hits += 1
+        else:
+            cache[key] = {"estimate": {"toAmountUSD": "99.06"}}
+    results.put((hits, total))
+
+
+def run(backend: str, workers: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "quote_cache.sqlite3")
+        make_cache(backend, maxsize=MAXSIZE, ttl=TTL, path=path)  # create the schema once
+        results = mp.Queue()
+        start = time.time() + 0.5
+        procs = [
+            mp.Process(target=worker, args=(w, workers, backend, path, start, results))
+            for w in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        counts = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+    hits = sum(h for h, _ in counts)
+    total = sum(t for _, t in counts)
+    return hits / total
+
+
+if __name__ == "__main__":
+    print(f"{RATE} req/s for {DURATION}s, TTL {TTL}s, maxsize {MAXSIZE}")
+    print(f"{'workers':>8} {'memory':>8} {'sqlite':>8}")
+    for workers in (1, 4, 8):
+        print(f"{workers:>8} {run('memory', workers):>8.1%} {run('sqlite', workers):>8.1%}")
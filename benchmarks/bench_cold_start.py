@@ -0,0 +1,134 @@
+"""
+Cold-start benchmark for the backend: import time of main, and for a fresh uvicorn process the
+time from spawn to the first /health, the first /ready and the first /api/v1/quote.
+
+LI.FI and OpenAI are replaced by a local mock server (LIFI_BASE_URL / OPENAI_BASE_URL), so the
+numbers measure the backend itself. Each figure is the median of RUNS fresh processes.
+
+Run from the repository root:  python -m benchmarks.bench_cold_start
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import orjson
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+RUNS = 5
+POLL_S = 0.005
+TIMEOUT_S = 60
+
+with open("sample_response.json", "rb") as f:
+    SAMPLE_QUOTE = f.read()
+
+COMPLETION = orjson.dumps({
+    "id": "chatcmpl-mock",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Bridge with AcrossV4 in about 48 seconds."},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+})
+
+mock = FastAPI()
+
+
+@mock.get("/v1/quote")
+async def mock_quote() -> Response:
+    return Response(SAMPLE_QUOTE, media_type="application/json")
+
+
+@mock.post("/v1/chat/completions")
+async def mock_completion(request: Request) -> Response:
+    return Response(COMPLETION, media_type="application/json")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock() -> int:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(mock, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def backend_env(mock_port: int) -> dict:
+    return {
+        **os.environ,
+        "OPENAI_API_KEY": "offline",
+        "LIFI_API_KEY": "offline",
+        "LIFI_BASE_URL": f"http://127.0.0.1:{mock_port}",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{mock_port}/v1",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{mock_port}/v1",
+        "TOKEN_INDEX": "false",
+    }
+
+
+def import_time(env: dict) -> float:
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def wait_for(client: httpx.Client, url: str, started: float, **params) -> float:
+    while time.perf_counter() - started < TIMEOUT_S:
+        try:
+            if client.get(url, params=params).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(POLL_S)
+    raise TimeoutError(url)
+
+
+def server_start(env: dict) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=TIMEOUT_S) as client:
+            health = wait_for(client, f"{base}/health", started)
+            quote = wait_for(
+                client, f"{base}/api/v1/quote", started,
+                fromChain="POL", toChain="ARB", fromToken="USDC", toToken="ETH", fromAmount="100000000",
+            )
+            ready = wait_for(client, f"{base}/ready", started)
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {"health": health, "ready": ready, "quote": quote}
+
+
+def main() -> None:
+    env = backend_env(start_mock())
+    imports = [import_time(env) for _ in range(RUNS)]
+    starts = [server_start(env) for _ in range(RUNS)]
+    print(f"median of {RUNS} fresh processes")
+    print(f"{'import main':<28} {statistics.median(imports) * 1000:>8.0f} ms")
+    for label, key in (("spawn -> first /health", "health"), ("spawn -> first quote", "quote"), ("spawn -> /ready", "ready")):
+        print(f"{label:<28} {statistics.median(s[key] for s in starts) * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Tail-latency benchmark for the latency-SLO degrade mode. The fake LLM usually answers in
+~300 ms but a few percent of calls take several seconds; LI.FI is a fast mock. Every request
+misses both caches, so the reported latency is the summary path.
+
+Run from the repository root:  python -m benchmarks.bench_degrade
+"""
+import asyncio
+import random
+from typing import Any, List
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.loadtest import BASE_PARAMS, FakeChatModel, drive, install_fakes
+import main
+
+REQUESTS = 400
+CONCURRENCY = 16
+FAST_S = 0.3
+SLOW_S = 4.0
+SLOW_RATE = 0.05
+BUDGET_S = 1.0
+
+
+class LongTailChatModel(FakeChatModel):
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(SLOW_S if random.random() < SLOW_RATE else FAST_S * random.uniform(0.8, 1.2))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+
+async def run(budget_s: float) -> None:
+    random.seed(11)
+    install_fakes(0.02, 0)
+    main.llm = LongTailChatModel()
+    main.chain = None
+    main.get_chain()
+    main.QUOTE_LATENCY_BUDGET_S = budget_s
+    degraded_before = sum(main.summary_degraded.values.values())
+    r = await drive([{**BASE_PARAMS, "fromAmount": str(10**8 + i * 10**6)} for i in range(REQUESTS)], CONCURRENCY)
+    degraded = sum(main.summary_degraded.values.values()) - degraded_before
+    label = f"{budget_s:g}s" if budget_s else "off"
+    print(
+        f"{label:<7} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        f" {degraded / r['requests']:>9.1%}"
+    )
+
+
+async def amain() -> None:
+    print(f"{REQUESTS} cache misses at concurrency {CONCURRENCY}; {SLOW_RATE:.0%} of LLM calls take {SLOW_S}s")
+    print(f"{'budget':<7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'template':>9}")
+    await run(0)
+    await run(BUDGET_S)
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
@@ -0,0 +1,87 @@
+"""
+Click-to-render time of "Find Best Route" in the Streamlit app, measured with Streamlit's
+AppTest (the script run triggered by the click, including the backend call), against a local
+mock backend that answers quotes after BACKEND_MS. Also counts the quote requests that reached
+the backend.
+
+Run from the repository root:
+    python -m benchmarks.bench_frontend_quote
+    python -m benchmarks.bench_frontend_quote --app /path/to/other/app.py   # e.g. an older version
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+from streamlit.testing.v1 import AppTest
+
+CLICKS = 10
+BACKEND_MS = 150
+
+backend_hits = {"quote": 0}
+mock = FastAPI()
+
+
+@mock.get("/api/v1/quote")
+async def mock_quote() -> dict:
+    backend_hits["quote"] += 1
+    await asyncio.sleep(BACKEND_MS / 1000)
+    return {
+        "summary": "Bridge with AcrossV4 in about 48 seconds for roughly $0.28 in fees, receiving about $99.06.",
+        "provider": "AcrossV4",
+        "time_seconds": 48,
+        "fees_usd": 0.28,
+        "output_usd": 99.06,
+    }
+
+
+@mock.get("/api/v1/tokens/{chain}/{token}")
+async def mock_token(chain: str, token: str) -> dict:
+    return {"chain": chain, "symbol": token, "decimals": 6}
+
+
+def start_mock() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(mock, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+def click_times(app_path: str) -> list:
+    at = AppTest.from_file(app_path, default_timeout=60)
+    at.run()
+    at.button(key="nav_Swap AI").click().run()
+    times = []
+    for _ in range(CLICKS):
+        find = next(b for b in at.button if "Find Best Route" in b.label)
+        started = time.perf_counter()
+        find.click().run()
+        times.append((time.perf_counter() - started) * 1000)
+        assert not at.exception, at.exception
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="app.py")
+    args = parser.parse_args()
+
+    os.environ["API_BASE_URL"] = f"http://127.0.0.1:{start_mock()}"
+    times = click_times(args.app)
+    print(f"{CLICKS} clicks on the same route, backend answers in {BACKEND_MS} ms")
+    print(f"first click       {times[0]:>8.1f} ms")
+    print(f"repeat (median)   {statistics.median(times[1:]):>8.1f} ms")
+    print(f"backend quote requests: {backend_hits['quote']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Per-rerun cost of each page of the Streamlit app: bytes of the ForwardMsgs the server sends to
+the browser for one script run, and the server-side time of that run. Measured with Streamlit's
+AppTest against a local mock backend whose /api/v1/stats is filled from QuoteRollups.
+
+The first run of a session is reported separately (it also carries one-off assets); the page
+figures are medians over RERUNS reruns of a session already on that page.
+
+Run from the repository root:
+    python -m benchmarks.bench_frontend_render
+    python -m benchmarks.bench_frontend_render --app /path/to/other/app.py   # e.g. an older version
+"""
+import argparse
+import os
+import random
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+from rollups import QuoteRollups
+
+RERUNS = 20
+PAGES = ("Dashboard", "Swap AI", "About")
+
+rollups = QuoteRollups()
+rng = random.Random(0)
+for i in range(500):
+    rollups.record(
+        rng.choice(["POL", "ARB", "ETH", "OPT", "BASE"]),
+        rng.choice(["USDC", "ETH", "USDT", "DAI"]),
+        rng.choice(["AcrossV4", "Stargate", "Hop", "CCTP"]),
+        rng.uniform(10, 5000),
+        rng.uniform(20, 600),
+        now=time.time() - rng.uniform(0, 3600),
+    )
+
+mock = FastAPI()
+
+
+@mock.get("/api/v1/stats")
+async def mock_stats() -> dict:
+    return rollups.snapshot()
+
+
+def start_mock() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(mock, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+# Record the serialized size of the messages of every script run AppTest parses.
+sent_bytes = []
+_parse_tree = local_script_runner.parse_tree_from_messages
+
+
+def _measure_parse_tree(messages):
+    sent_bytes.append(sum(msg.ByteSize() for msg in messages))
+    return _parse_tree(messages)
+
+
+local_script_runner.parse_tree_from_messages = _measure_parse_tree
+
+
+def timed_run(at: AppTest, action=None) -> tuple:
+    started = time.perf_counter()
+    (action or at).run()
+    elapsed = (time.perf_counter() - started) * 1000
+    assert not at.exception, at.exception
+    return sent_bytes[-1], elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="app.py")
+    args = parser.parse_args()
+
+    os.environ["API_BASE_URL"] = f"http://127.0.0.1:{start_mock()}"
+    at = AppTest.from_file(args.app, default_timeout=60)
+    first_bytes, first_ms = timed_run(at)
+
+    print(f"{'':<22} {'bytes':>9} {'render ms':>10}")
+    print(f"{'first run (Dashboard)':<22} {first_bytes:>9,} {first_ms:>10.1f}")
+    for page in PAGES:
+        timed_run(at, at.button(key=f"nav_{page}").click())
+        runs = [timed_run(at) for _ in range(RERUNS)]
+        page_bytes = statistics.median(b for b, _ in runs)
+        page_ms = statistics.median(ms for _, ms in runs)
+        print(f"{'rerun ' + page:<22} {page_bytes:>9,.0f} {page_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Tail-latency benchmark for upstream request hedging. The mock LI.FI answers in ~40 ms, but
+a few percent of calls stall for a couple of seconds. Every request misses the cache, and
+the LLM is near-instant, so the reported latency is the upstream path.
+
+Run from the repository root:  python -m benchmarks.bench_hedging
+"""
+import asyncio
+import random
+
+import httpx
+import orjson
+
+from benchmarks.loadtest import BASE_PARAMS, SAMPLE_QUOTE, drive, install_fakes
+import main
+from resilience import Hedger
+
+REQUESTS = 1000
+CONCURRENCY = 16
+FAST_S = 0.04
+SLOW_S = 2.0
+SLOW_RATE = 0.03
+
+
+def long_tail_transport(counter: dict) -> httpx.MockTransport:
+    body = orjson.dumps(SAMPLE_QUOTE)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counter["calls"] += 1
+        await asyncio.sleep(SLOW_S if random.random() < SLOW_RATE else FAST_S * random.uniform(0.8, 1.2))
+        return httpx.Response(200, content=body)
+
+    return httpx.MockTransport(handler)
+
+
+async def run(hedge: bool) -> None:
+    random.seed(7)
+    counter = {"calls": 0}
+    install_fakes(0, 0.001, transport=long_tail_transport(counter))
+    main.UPSTREAM_HEDGE = hedge
+    main.upstream_hedger = Hedger(percentile=main.UPSTREAM_HEDGE_PERCENTILE, budget=main.UPSTREAM_HEDGE_BUDGET)
+    # Warm the latency window so the hedger has a delay estimate.
+    await drive([{**BASE_PARAMS, "fromAmount": str(10**12 + i)} for i in range(50)], CONCURRENCY)
+    counter["calls"] = 0
+    r = await drive([{**BASE_PARAMS, "fromAmount": str(10**8 + i)} for i in range(REQUESTS)], CONCURRENCY)
+    extra = counter["calls"] / r["requests"] - 1
+    print(
+        f"{'on' if hedge else 'off':<6} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        f" {extra:>9.1%}"
+    )
+
+
+async def amain() -> None:
+    print(f"{REQUESTS} cache misses at concurrency {CONCURRENCY}; {SLOW_RATE:.0%} of upstream calls take {SLOW_S}s")
+    print(f"{'hedge':<6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'extra load':>9}")
+    await run(hedge=False)
+    await run(hedge=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
@@ -0,0 +1,97 @@
+"""
+Cost of journaling served quotes on the /api/v1/quote request path.
+
+Runs the loadtest "hit" scenario (cached quote and summary, so the journal is the largest
+remaining cost) with the journal off, with the batched background writer in drop and block
+mode, and with a naive writer that compresses and appends each record to its segment inside
+the request. Each writer also runs against a simulated slow disk (every write sleeps
+SLOW_DISK_MS). Reports req/s, p50/p99 latency, records written/dropped and compressed bytes
+per record on disk.
+
+Run from the repository root:  python -m benchmarks.bench_journal
+"""
+import asyncio
+import glob
+import os
+import tempfile
+import time
+
+from benchmarks.loadtest import drive, install_fakes, scenario_requests
+
+import main
+from journal import QuoteJournal, read_journal
+
+REQUESTS = 5000
+CONCURRENCY = 64
+SLOW_DISK_MS = 2
+
+
+class InlineJournal(QuoteJournal):
+    """Writes every record synchronously on the event loop, one zstd frame per record."""
+
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._task = asyncio.get_running_loop().create_future()
+
+    async def append(self, record: dict) -> None:
+        self._write([record])
+
+    async def close(self) -> None:
+        self._close_segment()
+        self._task = None
+
+
+class SlowDisk:
+    """Mixin adding SLOW_DISK_MS of blocking latency to every segment write."""
+
+    def _write(self, batch):
+        time.sleep(SLOW_DISK_MS / 1000)
+        super()._write(batch)
+
+
+class SlowInlineJournal(SlowDisk, InlineJournal):
+    pass
+
+
+class SlowQuoteJournal(SlowDisk, QuoteJournal):
+    pass
+
+
+async def run(label: str, journal: QuoteJournal, enabled: bool = True) -> None:
+    main.quote_journal = journal
+    if enabled:
+        journal.start()
+    requests = scenario_requests("hit", REQUESTS)
+    await drive(requests[:1], 1)
+    r = await drive(requests, CONCURRENCY)
+    assert not r["errors"], r
+    if not enabled:
+        print(f"{label:<14} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+        return
+    await journal.close()
+    on_disk = sum(os.path.getsize(p) for p in glob.glob(os.path.join(journal.directory, "*")))
+    records = sum(1 for _ in read_journal(journal.directory))
+    assert records == journal.written, (records, journal.written)
+    print(
+        f"{label:<14} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}"
+        f" {journal.written:>8} {journal.dropped:>8} {on_disk / max(records, 1):>10.1f}"
+    )
+
+
+async def amain() -> None:
+    install_fakes(upstream_latency_s=0.08, llm_latency_s=0.3)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{REQUESTS} cached quotes at concurrency {CONCURRENCY}")
+        print(f"{'journal':<14} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'written':>8} {'dropped':>8} {'bytes/rec':>10}")
+        await run("off", QuoteJournal(os.path.join(tmp, "off")), enabled=False)
+        await run("inline", InlineJournal(os.path.join(tmp, "inline")))
+        await run("batched drop", QuoteJournal(os.path.join(tmp, "drop")))
+        await run("batched block", QuoteJournal(os.path.join(tmp, "block"), backpressure="block"))
+        print(f"simulated disk: {SLOW_DISK_MS} ms per write")
+        await run("inline", SlowInlineJournal(os.path.join(tmp, "slow-inline")))
+        await run("batched drop", SlowQuoteJournal(os.path.join(tmp, "slow-drop")))
+        await run("batched block", SlowQuoteJournal(os.path.join(tmp, "slow-block"), backpressure="block"))
+
+
+if __name__ == "__main__":
+    asyncio.run(amain())
@@ -0,0 +1,46 @@
+"""
+Microbenchmark: stdlib json vs orjson for decoding the LI.FI quote in sample_response.json
+and for rendering a QuoteSummary response body.
+
+Run from the repository root:  python -m benchmarks.bench_json
+"""
+import json
+import timeit
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+with open("sample_response.json", "rb") as f:
+    RAW = f.read()
+
+SUMMARY = {
+    "summary": "Bridge 100 USDC from Polygon to Arbitrum with AcrossV4 in about 48 seconds, "
+               "paying roughly $0.28 in fees and receiving about $99.06 worth of ETH.",
+    "provider": "AcrossV4",
+    "time_seconds": 48,
+    "fees_usd": 0.2762,
+    "output_usd": 99.0625,
+    "cache_status": "miss",
+}
+
+
+def bench(label: str, fn, number: int) -> float:
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<28} {per_call * 1e6:9.2f} µs")
+    return per_call
+
+
+if __name__ == "__main__":
+    assert json.loads(RAW) == orjson.loads(RAW)
+
+    print(f"Decode sample_response.json ({len(RAW) / 1024:.1f} KB)")
+    slow = bench("json.loads", lambda: json.loads(RAW), 2000)
+    fast = bench("orjson.loads", lambda: orjson.loads(RAW), 2000)
+    print(f"  speedup: {slow / fast:.1f}x")
+
+    print("Render QuoteSummary response body")
+    body = jsonable_encoder(SUMMARY)
+    slow = bench("JSONResponse", lambda: JSONResponse(body), 50000)
+    fast = bench("ORJSONResponse", lambda: ORJSONResponse(body), 50000)
+    print(f"  speedup: {slow / fast:.1f}x")
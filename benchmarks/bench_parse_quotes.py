@@ -0,0 +1,100 @@
+"""
+Throughput of the columnar quote parser, parse_quotes(), over N LI.FI quotes, against:
+- the previous parse_quote loop (fees/output only, float() on every fee string), and
+- a per-quote loop extracting the same fields as parse_quotes (gas, in USD, per-step costs).
+"from bytes" rows include orjson.loads of the stored response bodies, as for a quote archive.
+
+Run from the repository root:  python -m benchmarks.bench_parse_quotes
+"""
+import time
+
+import orjson
+
+from quote_table import parse_quotes
+
+SIZES = (1, 100, 10000)
+
+with open("sample_response.json", "rb") as f:
+    RAW = f.read()
+
+
+def _usd(costs) -> float:
+    total = 0.0
+    for cost in costs:
+        total += float(cost.get("amountUSD") or "0")
+    return total
+
+
+def loop_parse_quote(quote_data: dict) -> dict:
+    """parse_quote as it was before the columnar parser."""
+    estimate = quote_data.get("estimate", {})
+    tool_details = quote_data.get("toolDetails", {})
+    total_fees_usd = 0
+    for fee in estimate.get("feeCosts", []):
+        total_fees_usd += float(fee.get("amountUSD", "0"))
+    return {
+        "provider": tool_details.get("name", "N/A"),
+        "time_seconds": estimate.get("executionDuration", 0),
+        "fees_usd": total_fees_usd,
+        "output_usd": float(estimate.get("toAmountUSD", "0")),
+    }
+
+
+def loop_parse_full(quote_data: dict) -> dict:
+    """The fields parse_quotes extracts, one quote at a time into dicts."""
+    estimate = quote_data.get("estimate", {})
+    steps = []
+    for step in quote_data.get("includedSteps", ()):
+        step_estimate = step.get("estimate", {})
+        steps.append({
+            "type": step.get("type", ""),
+            "tool": step.get("toolDetails", {}).get("name", step.get("tool", "N/A")),
+            "time_seconds": step_estimate.get("executionDuration", 0),
+            "fees_usd": _usd(step_estimate.get("feeCosts", ())),
+            "gas_usd": _usd(step_estimate.get("gasCosts", ())),
+        })
+    return {
+        "provider": quote_data.get("toolDetails", {}).get("name", "N/A"),
+        "time_seconds": estimate.get("executionDuration", 0),
+        "fees_usd": _usd(estimate.get("feeCosts", ())),
+        "gas_usd": _usd(estimate.get("gasCosts", ())),
+        "from_usd": float(estimate.get("fromAmountUSD") or "0"),
+        "output_usd": float(estimate.get("toAmountUSD") or "0"),
+        "steps": steps,
+    }
+
+
+def bodies(n: int) -> list:
+    """n distinct response bodies (toAmountUSD varies)."""
+    result = []
+    for i in range(n):
+        quote = orjson.loads(RAW)
+        quote["estimate"]["toAmountUSD"] = f"{99 + i / 100000:.5f}"
+        result.append(orjson.dumps(quote))
+    return result
+
+
+def quotes_per_s(fn, batch: list) -> float:
+    repeat = max(3, 50000 // len(batch))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(batch)
+    return repeat * len(batch) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    print(f"{'quotes':>7} {'input':<11} {'old loop q/s':>13} {'full loop q/s':>14} {'columnar q/s':>13}")
+    for n in SIZES:
+        raw = bodies(n)
+        batch = [orjson.loads(body) for body in raw]
+        table = parse_quotes(batch)
+        assert [table.row(i) for i in range(n)] == [loop_parse_quote(q) for q in batch]
+        for label, data, load in (("dicts", batch, lambda b: b), ("from bytes", raw, lambda b: map(orjson.loads, b))):
+            old = quotes_per_s(lambda b: [loop_parse_quote(q) for q in load(b)], data)
+            full = quotes_per_s(lambda b: [loop_parse_full(q) for q in load(b)], data)
+            columnar = quotes_per_s(lambda b: parse_quotes(load(b)), data)
+            print(f"{n:>7} {label:<11} {old:>13,.0f} {full:>14,.0f} {columnar:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Memory benchmark: a full quote_cache of raw LI.FI response dicts vs. compact QuoteRecords
+(with and without the zstd-compressed raw body kept for debugging).
+
+Run from the repository root:  OPENAI_API_KEY=x LIFI_API_KEY=x python -m benchmarks.bench_quote_record
+"""
+import gc
+import tracemalloc
+
+import orjson
+
+from main import QuoteRecord
+
+ENTRIES = 1000
+
+with open("sample_response.json", "rb") as f:
+    RAW = f.read()
+
+
+def variant(i: int) -> bytes:
+    """A distinct response body per entry, so nothing is shared between cache entries."""
+    quote = orjson.loads(RAW)
+    quote["id"] = f"{quote['id']}-{i}"
+    quote["estimate"]["toAmountUSD"] = f"{99 + i / 1000:.4f}"
+    return orjson.dumps(quote)
+
+
+def measure(label: str, build) -> int:
+    bodies = [variant(i) for i in range(ENTRIES)]
+    gc.collect()
+    tracemalloc.start()
+    cache = {i: build(body) for i, body in enumerate(bodies)}
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    print(f"  {label:<28} {size / 2**20:8.2f} MB  ({size / ENTRIES / 1024:6.1f} KB/entry)")
+    return size
+
+
+if __name__ == "__main__":
+    print(f"{ENTRIES} cached quotes built from sample_response.json ({len(RAW) / 1024:.1f} KB each)")
+    full = measure("raw dict (before)", orjson.loads)
+    compact = measure("QuoteRecord", QuoteRecord.from_response)
+    with_raw = measure("QuoteRecord + zstd raw", lambda b: QuoteRecord.from_response(b, keep_raw=True))
+    print(f"  QuoteRecord is {full / compact:.0f}x smaller; with raw kept {full / with_raw:.1f}x smaller")
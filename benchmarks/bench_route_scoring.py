@@ -0,0 +1,74 @@
+"""
+Cost of ranking LI.FI route candidates: parse_routes() over the JSON candidates, then
+score_routes() + top_k() over the NumPy columns, compared with a pure-Python loop that
+scores every candidate the same way and sorts.
+
+Run from the repository root:  python -m benchmarks.bench_route_scoring
+"""
+import random
+import time
+
+from routes import STRATEGIES, parse_routes, score_routes, top_k
+
+SIZES = (10, 100, 1000, 10000)
+K = 3
+
+
+def fake_routes(n: int) -> list:
+    rng = random.Random(n)
+    return [
+        {
+            "id": f"route-{i}",
+            "toAmountUSD": f"{rng.uniform(95, 100):.4f}",
+            "gasCostUSD": f"{rng.uniform(0.01, 3):.4f}",
+            "steps": [
+                {
+                    "toolDetails": {"name": rng.choice(("AcrossV4", "Stargate", "Hop", "CBridge"))},
+                    "estimate": {
+                        "executionDuration": rng.randint(10, 900),
+                        "feeCosts": [{"amountUSD": f"{rng.uniform(0, 1):.4f}"}],
+                        "gasCosts": [{"amountUSD": "0.1"}],
+                    },
+                }
+                for _ in range(rng.randint(1, 3))
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def loop_rank(metrics: list, weights: list, k: int) -> list:
+    columns = list(zip(*metrics))
+    lows = [min(c) for c in columns]
+    spans = [(max(c) - low) or 1.0 for c, low in zip(columns, lows)]
+    scores = [
+        sum(w * (v - low) / span for w, v, low, span in zip(weights, row, lows, spans))
+        for row in metrics
+    ]
+    return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+
+
+def per_call_us(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main() -> None:
+    weights = STRATEGIES["balanced"]
+    print(f"{'routes':>7} {'parse us':>10} {'rank us':>9} {'loop rank us':>13}")
+    for n in SIZES:
+        routes = fake_routes(n)
+        table = parse_routes(routes)
+        rows, weight_list = table.metrics.tolist(), weights.tolist()
+        assert list(top_k(score_routes(table.metrics, weights), K)) == loop_rank(rows, weight_list, K)
+        repeat = max(10, 20000 // n)
+        parse_us = per_call_us(lambda: parse_routes(routes), max(3, repeat // 10))
+        rank_us = per_call_us(lambda: top_k(score_routes(table.metrics, weights), K), repeat)
+        loop_us = per_call_us(lambda: loop_rank(rows, weight_list, K), repeat)
+        print(f"{n:>7} {parse_us:>10.1f} {rank_us:>9.1f} {loop_us:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Offline load test for /api/v1/quote.
+
+The FastAPI app runs in-process. async_client is swapped for an httpx.MockTransport serving
+sample_response.json, and the LLM for a fake chat model, both with configurable latency and
+error rates, so runs need neither li.quest nor OpenAI. For each scenario and concurrency
+level it reports requests/s and p50/p95/p99 latency.
+
+Run from the repository root:
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --scenario miss --concurrency 1,16,64 --upstream-ms 120 --llm-ms 600
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+os.environ.setdefault("LIFI_API_KEY", "offline")
+
+import httpx
+import orjson
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+import main
+
+with open("sample_response.json", "rb") as f:
+    SAMPLE_QUOTE = orjson.loads(f.read())
+
+BASE_PARAMS = {"fromChain": "POL", "toChain": "ARB", "fromToken": "USDC", "toToken": "ETH"}
+SCENARIOS = ("hit", "miss", "errors")
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers a fixed sentence after delay_s, failing with error_rate."""
+
+    delay_s: float = 0.3
+    error_rate: float = 0.0
+    reply: str = "Bridge with AcrossV4 in about 48 seconds for roughly $0.28 in fees, receiving about $99.06."
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _maybe_fail(self) -> None:
+        if self.error_rate and random.random() < self.error_rate:
+            raise RuntimeError("fake LLM error")
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.delay_s)
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.delay_s)
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    async def _astream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        words = self.reply.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.delay_s / len(words))
+            self._maybe_fail()
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else " " + word))
+
+
+def mock_lifi_transport(latency_s: float, error_rate: float = 0.0) -> httpx.MockTransport:
+    """Serve sample_response.json, scaling toAmountUSD with fromAmount so quotes differ."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_s)
+        if error_rate and random.random() < error_rate:
+            return httpx.Response(503, text="mock upstream unavailable")
+        quote = dict(SAMPLE_QUOTE)
+        estimate = dict(quote["estimate"])
+        scale = int(request.url.params.get("fromAmount", "100000000")) / 100_000_000
+        estimate["toAmountUSD"] = f"{float(estimate['toAmountUSD']) * scale:.4f}"
+        quote["estimate"] = estimate
+        return httpx.Response(200, content=orjson.dumps(quote))
+
+    return httpx.MockTransport(handler)
+
+
+def install_fakes(
+    upstream_latency_s: float,
+    llm_latency_s: float,
+    upstream_error_rate: float = 0.0,
+    llm_error_rate: float = 0.0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> None:
+    """Point main at the mock LI.FI transport and the fake LLM, and reset its caches."""
+    main.async_client = httpx.AsyncClient(
+        base_url="https://li.quest",
+        transport=transport or mock_lifi_transport(upstream_latency_s, upstream_error_rate),
+    )
+    main.llm = FakeChatModel(delay_s=llm_latency_s, error_rate=llm_error_rate)
+    main.chain = None
+    main.get_chain()
+    main.quote_cache.clear()
+    main.summary_cache.clear()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def drive(params_list: List[Dict[str, str]], concurrency: int, path: str = "/api/v1/quote") -> Dict[str, float]:
+    """Send every request in params_list to main.app with the given concurrency."""
+    # Unhandled app exceptions count as 500 responses, as they would behind uvicorn.
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for params in params_list:
+        queue.put_nowait(params)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        async def worker() -> None:
+            nonlocal errors
+            while not queue.empty():
+                params = queue.get_nowait()
+                started = time.perf_counter()
+                resp = await client.get(path, params=params)
+                latencies.append(time.perf_counter() - started)
+                if resp.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+def scenario_requests(scenario: str, count: int) -> List[Dict[str, str]]:
+    if scenario == "hit":
+        return [{**BASE_PARAMS, "fromAmount": "100000000"}] * count
+    # Unique amounts so every request misses quote_cache and summary_cache.
+    return [{**BASE_PARAMS, "fromAmount": str(100_000_000 + i * 1_000_000)} for i in range(count)]
+
+
+async def run_scenario(scenario: str, concurrency: int, args: argparse.Namespace) -> Dict[str, float]:
+    install_fakes(
+        upstream_latency_s=args.upstream_ms / 1000,
+        llm_latency_s=args.llm_ms / 1000,
+        upstream_error_rate=args.error_rate if scenario == "errors" else 0.0,
+        llm_error_rate=args.llm_error_rate if scenario == "errors" else 0.0,
+    )
+    requests = scenario_requests(scenario, args.requests)
+    if scenario == "hit":
+        await drive(requests[:1], 1)  # warm the caches
+    return await drive(requests, concurrency)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default="all", choices=("all",) + SCENARIOS)
+    parser.add_argument("--concurrency", default="1,8,32,128", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario and level")
+    parser.add_argument("--upstream-ms", type=float, default=80.0, help="mock LI.FI latency")
+    parser.add_argument("--llm-ms", type=float, default=300.0, help="fake LLM latency")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="upstream 503 rate in the errors scenario")
+    parser.add_argument("--llm-error-rate", type=float, default=0.05, help="LLM error rate in the errors scenario")
+    return parser.parse_args(argv)
+
+
+async def amain(args: argparse.Namespace) -> None:
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    print(f"upstream {args.upstream_ms:.0f} ms, LLM {args.llm_ms:.0f} ms, {args.requests} requests per run")
+    print(f"{'scenario':<8} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for scenario in scenarios:
+        for concurrency in levels:
+            r = await run_scenario(scenario, concurrency, args)
+            print(
+                f"{scenario:<8} {concurrency:>5} {r['rps']:>9.1f} {r['p50_ms']:>8.1f}"
+                f" {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(amain(parse_args()))
@@ -0,0 +1,132 @@
+"""
+Replay recorded production traffic against main.app, offline.
+
+Inputs are two recordings made by a backend running with:
+    QUOTE_JOURNAL=true QUOTE_JOURNAL_DIR=<journal dir>      the served /api/v1/quote requests
+    TRAFFIC_RECORD_DIR=<recordings dir>                     the LI.FI and OpenAI traffic
+
+The app runs in-process with TRAFFIC_REPLAY_DIR pointing at the recordings, so every upstream
+call is answered from them through the replay transports (see recording.py), after the
+recorded latency times --latency-scale. The journal's requests are then sent either closed-loop
+at each --concurrency level (via loadtest.drive) or, with --speed, open-loop at their recorded
+arrival times sped up by that factor. Reports requests/s, p50/p95/p99 latency, errors, and the
+upstream requests that had no recording.
+
+Run from the repository root:
+    python -m benchmarks.replay journal/ recordings/
+    python -m benchmarks.replay journal/ recordings/ --speed 10 --latency-scale 0.5
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("journal", help="quote journal segment or directory (QUOTE_JOURNAL_DIR)")
+    parser.add_argument("recordings", help="upstream recordings segment or directory (TRAFFIC_RECORD_DIR)")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated closed-loop concurrency levels")
+    parser.add_argument("--speed", type=float, default=0.0, help="replay open-loop at recorded arrival times / speed")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply recorded upstream latencies")
+    parser.add_argument("--limit", type=int, default=0, help="replay at most this many requests")
+    return parser.parse_args(argv)
+
+
+def load_requests(path: str, limit: int) -> List[dict]:
+    """(arrival time, query params) of each journaled quote, in arrival order."""
+    from journal import read_journal
+
+    requests = []
+    for record in read_journal(path):
+        params = {k: v for k, v in record["request"].items() if v is not None}
+        requests.append({"arrival": record["ts"] - record["latency_ms"] / 1000, "params": params})
+    requests.sort(key=lambda r: r["arrival"])
+    return requests[:limit] if limit else requests
+
+
+async def drive_paced(requests: List[dict], speed: float) -> Dict[str, float]:
+    """Send each request at its recorded arrival offset divided by speed, regardless of responses."""
+    import httpx
+
+    import main
+    from benchmarks.loadtest import percentile
+
+    transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False)
+    latencies: List[float] = []
+    errors = 0
+    first = requests[0]["arrival"]
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=None) as client:
+        started = time.perf_counter()
+
+        async def send(request: dict) -> None:
+            nonlocal errors
+            await asyncio.sleep((request["arrival"] - first) / speed - (time.perf_counter() - started))
+            sent = time.perf_counter()
+            resp = await client.get("/api/v1/quote", params=request["params"])
+            latencies.append(time.perf_counter() - sent)
+            if resp.status_code >= 400:
+                errors += 1
+
+        await asyncio.gather(*(send(r) for r in requests))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def amain(args: argparse.Namespace) -> None:
+    # main reads its configuration at import, so the environment is set before importing it.
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+    os.environ.setdefault("LIFI_API_KEY", "offline")
+    os.environ["TRAFFIC_REPLAY_DIR"] = args.recordings
+    os.environ["TRAFFIC_REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ["QUOTE_JOURNAL"] = "false"
+    os.environ.setdefault("TOKEN_INDEX", "false")
+
+    import main
+    from benchmarks.loadtest import drive
+
+    requests = load_requests(args.journal, args.limit)
+    if not requests:
+        raise SystemExit(f"no journaled requests in {args.journal}")
+    print(
+        f"{len(requests)} requests, {main.replay_store.stats()['recordings']} upstream recordings,"
+        f" latency scale {args.latency_scale:g}"
+    )
+    print(f"{'mode':<12} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'unmatched':>10}")
+
+    await main.on_startup()
+    # Measure from readiness, as a load balancer would: wait for the background LLM setup.
+    await main.ensure_chain()
+    try:
+        if args.speed:
+            runs = [(f"{args.speed:g}x paced", lambda: drive_paced(requests, args.speed))]
+        else:
+            params = [r["params"] for r in requests]
+            runs = [(f"conc {c}", lambda c=c: drive(params, c)) for c in map(int, args.concurrency.split(","))]
+        for label, run in runs:
+            # Each run starts cold, like the recorded process did.
+            main.quote_cache.clear()
+            main.summary_cache.clear()
+            misses = main.replay_store.misses
+            r = await run()
+            print(
+                f"{label:<12} {r['rps']:>9.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}"
+                f" {r['p99_ms']:>8.1f} {r['errors']:>7} {main.replay_store.misses - misses:>10}"
+            )
+    finally:
+        await main.on_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(amain(parse_args()))
@@ -0,0 +1,241 @@
+"""
+Cache backends for quote_cache.
+
+The default MemoryCache is a process-local cachetools.TTLCache. SQLiteCache stores the same
+entries in a SQLite database in WAL mode, so every uvicorn worker on a node shares one cache.
+Both evict expired entries first and then the least recently used ones once maxsize is reached.
+"""
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import orjson
+from cachetools import TTLCache
+
+
+class CacheBackend:
+    """
+    The mapping subset quote_cache needs: get/contains/getitem/setitem/len/clear.
+    evictions counts entries dropped by this process because the cache was full; busy_skips
+    counts lookups and writes skipped because a shared backend was busy.
+    """
+
+    maxsize: int
+    ttl: float
+    evictions: int = 0
+    busy_skips: int = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+_MISSING = object()
+
+
+class _EvictionCountingTTLCache(TTLCache):
+    """TTLCache calls popitem() only to make room, so counting calls counts evictions."""
+
+    def __init__(self, owner: "MemoryCache", **kwargs: Any):
+        super().__init__(**kwargs)
+        self._owner = owner
+
+    def popitem(self):
+        item = super().popitem()
+        self._owner.evictions += 1
+        return item
+
+
+class MemoryCache(CacheBackend):
+    """Process-local LRU + TTL cache (the original quote_cache behaviour)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._cache = _EvictionCountingTTLCache(self, maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._cache.get(key, default)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._cache[key] = value
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        # TTLCache.clear() pops items one by one, which would be counted as evictions.
+        self._cache = _EvictionCountingTTLCache(self, maxsize=self.maxsize, ttl=self.ttl)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cross-process LRU + TTL cache in a SQLite file. WAL mode lets readers in other
+    processes proceed while one process writes. Keys must be JSON-serializable tuples;
+    values are serialized with dumps/loads (orjson by default).
+
+    Calls run on the caller's thread (the event loop), so none of them may wait long:
+    - get() is a plain SELECT, which never waits for the write lock in WAL mode. Access
+      times for LRU are collected in memory and written with the next write (or once
+      touch_batch hits are pending).
+    - Writes wait at most busy_timeout_s for the write lock; if another process holds it
+      longer, get() treats it as a miss and a set is skipped (counted in busy_skips).
+    - The row count is kept in quote_cache_meta by triggers, so inserts don't scan the table.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int,
+        ttl: float,
+        dumps: Callable[[Any], bytes] = orjson.dumps,
+        loads: Callable[[bytes], Any] = orjson.loads,
+        busy_timeout_s: float = 0.05,
+        touch_batch: int = 256,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.busy_skips = 0
+        self._dumps = dumps
+        self._loads = loads
+        self._touch_batch = touch_batch
+        self._touched: Dict[str, float] = {}
+        # Imported here so processes using the memory backend never pay for SQLAlchemy.
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.exc import OperationalError
+
+        self._busy_error = OperationalError
+        self._engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": busy_timeout_s})
+
+        @event.listens_for(self._engine, "connect")
+        def _set_pragmas(dbapi_conn, _record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        # Schema setup may wait for other workers doing the same at startup.
+        with self._engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA busy_timeout = {int(max(busy_timeout_s, 5) * 1000)}")
+            conn.exec_driver_sql(
+                "CREATE TABLE IF NOT EXISTS quote_cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS quote_cache_accessed ON quote_cache (accessed_at)")
+            conn.exec_driver_sql(
+                "CREATE TABLE IF NOT EXISTS quote_cache_meta (id INTEGER PRIMARY KEY CHECK (id = 1), rows INTEGER NOT NULL)"
+            )
+            conn.exec_driver_sql(
+                "INSERT OR IGNORE INTO quote_cache_meta VALUES (1, (SELECT COUNT(*) FROM quote_cache))"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS quote_cache_insert AFTER INSERT ON quote_cache"
+                " BEGIN UPDATE quote_cache_meta SET rows = rows + 1 WHERE id = 1; END"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS quote_cache_delete AFTER DELETE ON quote_cache"
+                " BEGIN UPDATE quote_cache_meta SET rows = rows - 1 WHERE id = 1; END"
+            )
+            conn.exec_driver_sql(f"PRAGMA busy_timeout = {int(busy_timeout_s * 1000)}")
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return orjson.dumps(list(key) if isinstance(key, tuple) else key).decode()
+
+    def _flush_touched(self, conn) -> None:
+        if self._touched:
+            conn.exec_driver_sql(
+                "UPDATE quote_cache SET accessed_at = MAX(accessed_at, :now) WHERE key = :key",
+                [{"key": key, "now": now} for key, now in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.time()
+        sql_key = self._key(key)
+        try:
+            with self._engine.connect() as conn:
+                row = conn.exec_driver_sql(
+                    "SELECT value FROM quote_cache WHERE key = :key AND expires_at > :now",
+                    {"key": sql_key, "now": now},
+                ).first()
+        except self._busy_error:
+            self.busy_skips += 1
+            return default
+        if row is None:
+            return default
+        self._touched[sql_key] = now
+        if len(self._touched) >= self._touch_batch:
+            try:
+                with self._engine.begin() as conn:
+                    self._flush_touched(conn)
+            except self._busy_error:
+                # Access times are best effort; keep them for the next write.
+                self.busy_skips += 1
+        return self._loads(row[0])
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.time()
+        try:
+            with self._engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "INSERT INTO quote_cache VALUES (:key, :value, :expires_at, :now)"
+                    " ON CONFLICT (key) DO UPDATE SET value = excluded.value,"
+                    " expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                    {"key": self._key(key), "value": self._dumps(value), "expires_at": now + self.ttl, "now": now},
+                )
+                self._flush_touched(conn)
+                count = conn.exec_driver_sql("SELECT rows FROM quote_cache_meta WHERE id = 1").scalar_one()
+                if count > self.maxsize:
+                    conn.exec_driver_sql("DELETE FROM quote_cache WHERE expires_at <= :now", {"now": now})
+                    evicted = conn.exec_driver_sql(
+                        "DELETE FROM quote_cache WHERE key IN ("
+                        " SELECT key FROM quote_cache ORDER BY accessed_at LIMIT"
+                        " MAX((SELECT rows FROM quote_cache_meta WHERE id = 1) - :maxsize, 0))",
+                        {"maxsize": self.maxsize},
+                    )
+                    self.evictions += evicted.rowcount
+        except self._busy_error:
+            # Another process held the write lock past busy_timeout_s: skip caching this entry
+            # rather than stall the event loop.
+            self.busy_skips += 1
+
+    def __len__(self) -> int:
+        with self._engine.connect() as conn:
+            return conn.exec_driver_sql(
+                "SELECT COUNT(*) FROM quote_cache WHERE expires_at > :now", {"now": time.time()}
+            ).scalar_one()
+
+    def clear(self) -> None:
+        self._touched.clear()
+        with self._engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM quote_cache")
+
+
+def make_cache(backend: str, maxsize: int, ttl: float, path: Optional[str] = None, **kwargs: Any) -> CacheBackend:
+    """
+    Build the cache backend named by backend ("memory" or "sqlite"). Extra keyword
+    arguments (dumps/loads) only apply to backends that serialize values.
+    """
+    if backend == "memory":
+        return MemoryCache(maxsize=maxsize, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteCache(path or "quote_cache.sqlite3", maxsize=maxsize, ttl=ttl, **kwargs)
+    raise ValueError(f"Unknown cache backend: {backend!r} (expected 'memory' or 'sqlite')")
@@ -0,0 +1,187 @@
+"""
+Append-only journal of served quotes, for auditing and offline analysis.
+
+Request handlers put a record (a plain dict) on a bounded in-memory asyncio.Queue and move on. A
+background task collects up to batch_size records (or whatever arrived within flush_interval_s)
+and hands the batch to a worker thread, which serializes it as JSON lines, compresses it into
+one zstd frame and appends it to the current segment, so the event loop never waits on
+compression or disk I/O. Because every batch is a complete frame, a segment is readable up to
+the last flushed batch even if the process dies.
+
+Segments are named <prefix>-<UTC start>-<pid>-<seq>.jsonl.zst (one writer per uvicorn worker)
+and rotate once they reach segment_bytes of compressed data or are segment_s seconds old.
+
+When the queue is full, backpressure="drop" discards the record (counted in dropped) and
+backpressure="block" makes the caller wait for room.
+"""
+import asyncio
+import glob
+import io
+import os
+import time
+from typing import IO, Iterator, List, Optional
+
+import orjson
+import zstandard
+
+BACKPRESSURE_MODES = ("drop", "block")
+_STOP = None
+
+
+class QuoteJournal:
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "quotes",
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_s: float = 1.0,
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_s: float = 3600.0,
+        backpressure: str = "drop",
+        level: int = 3,
+    ):
+        if backpressure not in BACKPRESSURE_MODES:
+            raise ValueError(f"backpressure must be one of {BACKPRESSURE_MODES}, got {backpressure!r}")
+        self.directory = directory
+        self.prefix = prefix
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.segment_bytes = segment_bytes
+        self.segment_s = segment_s
+        self.backpressure = backpressure
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.segments = 0
+        self.queue: Optional["asyncio.Queue[Optional[dict]]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._file: Optional[IO[bytes]] = None
+        self._segment_path: Optional[str] = None
+        self._segment_size = 0
+        self._segment_started = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start the background writer on the running event loop."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def append(self, record: dict) -> None:
+        """Queue a record for writing. A no-op until start() has been called."""
+        if self._task is None:
+            return
+        if self.backpressure == "block":
+            await self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def close(self) -> None:
+        """Write everything still queued, close the current segment and stop the writer."""
+        if self._task is None:
+            return
+        await self.queue.put(_STOP)
+        await self._task
+        self._task = None
+        await asyncio.to_thread(self._close_segment)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.running,
+            "backpressure": self.backpressure,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "segments": self.segments,
+            "segment": self._segment_path,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            record = await self.queue.get()
+            if record is _STOP:
+                break
+            batch = [record]
+            deadline = loop.time() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        record = await asyncio.wait_for(self.queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as err:
+                self.errors += len(batch)
+                print(f"⚠️ Quote journal write failed: {err}")
+
+    def _write(self, batch: List[dict]) -> None:
+        payload = b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in batch)
+        frame = self._compressor.compress(payload)
+        if (
+            self._file is None
+            or self._segment_size >= self.segment_bytes
+            or time.time() - self._segment_started >= self.segment_s
+        ):
+            self._rotate()
+        self._file.write(frame)
+        self._file.flush()
+        self._segment_size += len(frame)
+        self.written += len(batch)
+
+    def _rotate(self) -> None:
+        self._close_segment()
+        self._segment_started = time.time()
+        started = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(self._segment_started))
+        name = f"{self.prefix}-{started}-{os.getpid()}-{self.segments:06d}.jsonl.zst"
+        self._segment_path = os.path.join(self.directory, name)
+        self._file = open(self._segment_path, "xb")
+        self._segment_size = 0
+        self.segments += 1
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_journal(path: str) -> Iterator[dict]:
+    """
+    Records from one segment, or from every segment in a directory in name order. A segment
+    whose last frame was cut short (the process died mid-write) yields its complete records.
+    """
+    if os.path.isdir(path):
+        segments = sorted(glob.glob(os.path.join(path, "*.jsonl.zst")))
+    else:
+        segments = [path]
+    for segment in segments:
+        with open(segment, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            lines = io.BufferedReader(reader)
+            try:
+                for line in lines:
+                    if line.endswith(b"\n"):
+                        yield orjson.loads(line)
+            except zstandard.ZstdError:
+                continue
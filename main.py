@@ -1,19 +1,37 @@
 import os
-import json
+import base64
+import math
+import time
+import random
 import asyncio
-from typing import Optional
+import threading
+from bisect import bisect_left
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
 
 import httpx
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+import zstandard
+from fastapi import Body, Depends, FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 from pydantic import SecretStr, BaseModel, Field
 from cachetools import TTLCache
 from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from cache_backends import CacheBackend, make_cache
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Registry
+from resilience import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, ConcurrencyLimitExceeded, Hedger, LatencyWindow
+from quote_table import parse_quotes
+from token_index import TokenIndex, TokenInfo
+from rollups import QuoteRollups
+from journal import QuoteJournal
+from recording import RecordingTransport, ReplayStore, ReplayTransport
+from routes import METRIC_COLUMNS, STRATEGIES, RouteTable, parse_routes, score_routes, top_k
+
 # --- 1. Load and Validate Environment Variables ---
 # This loads the .env file at the start of the application.
 load_dotenv()
@@ -21,6 +39,7 @@ load_dotenv()
 # We immediately get the API keys from the environment.
 LIFI_API_KEY = os.getenv("LIFI_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+LIFI_BASE_URL = os.getenv("LIFI_BASE_URL", "https://li.quest")
 
 # This is a critical check. If the keys are not found, the server will stop
 # with a clear error message. This prevents it from running in a broken state.
@@ -29,11 +48,134 @@ if not LIFI_API_KEY or not OPENAI_API_KEY:
 
 print("✅ API keys and environment variables loaded successfully.")
 
+# Quote cache: "memory" keeps a per-process TTLCache; "sqlite" shares one cache file
+# (QUOTE_CACHE_PATH) between all uvicorn workers on the node.
+QUOTE_CACHE_BACKEND = os.getenv("QUOTE_CACHE_BACKEND", "memory")
+QUOTE_CACHE_PATH = os.getenv("QUOTE_CACHE_PATH", "quote_cache.sqlite3")
+QUOTE_CACHE_SIZE = int(os.getenv("QUOTE_CACHE_SIZE", "1000"))
+QUOTE_CACHE_TTL = float(os.getenv("QUOTE_CACHE_TTL", "60"))
+# Stale-while-revalidate: past QUOTE_CACHE_SOFT_TTL seconds an entry is served as "stale" and
+# refreshed in the background; QUOTE_CACHE_TTL is the hard limit. 0 disables the soft TTL.
+QUOTE_CACHE_SOFT_TTL = float(os.getenv("QUOTE_CACHE_SOFT_TTL", "0"))
+# Approximate reuse: on an exact miss, a fresh cached quote for the same pair whose fromAmount is
+# within QUOTE_APPROX_TOLERANCE (relative, e.g. 0.01 = 1%) is rescaled and served as "approximate".
+# 0 disables it.
+QUOTE_APPROX_TOLERANCE = float(os.getenv("QUOTE_APPROX_TOLERANCE", "0"))
+# Keep the zstd-compressed LI.FI response next to each compact cached quote, for debugging.
+QUOTE_CACHE_KEEP_RAW = os.getenv("QUOTE_CACHE_KEEP_RAW", "false").lower() in ("1", "true", "yes")
+
+# Summary cache tuning. Route numbers are bucketed before lookup so near-identical quotes
+# share one LLM summary: fees/output are rounded to SUMMARY_CACHE_ROUND_DIGITS decimals, or,
+# when SUMMARY_CACHE_BUCKET_PCT > 0, snapped to relative buckets of that percentage.
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "2000"))
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", "600"))
+SUMMARY_CACHE_ROUND_DIGITS = int(os.getenv("SUMMARY_CACHE_ROUND_DIGITS", "2"))
+SUMMARY_CACHE_BUCKET_PCT = float(os.getenv("SUMMARY_CACHE_BUCKET_PCT", "0"))
+
+# LLM concurrency: at most LLM_MAX_CONCURRENCY summaries are generated at once, and each
+# call is abandoned after LLM_TIMEOUT seconds.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+
+# Latency SLO for /api/v1/quote (0 disables each check). If the LLM summary isn't ready within
+# QUOTE_LATENCY_BUDGET_S of the request starting, or the p95 of LLM calls over the last
+# LLM_SLO_WINDOW_S seconds exceeds LLM_SLO_P95_S, a template summary built from the parsed quote
+# is returned instead. With SUMMARY_BACKFILL the LLM call still completes and fills summary_cache;
+# at most one backfill runs per summary key and at most SUMMARY_BACKFILL_MAX at once (extras are
+# dropped).
+QUOTE_LATENCY_BUDGET_S = float(os.getenv("QUOTE_LATENCY_BUDGET_S", "0"))
+LLM_SLO_P95_S = float(os.getenv("LLM_SLO_P95_S", "0"))
+LLM_SLO_WINDOW_S = float(os.getenv("LLM_SLO_WINDOW_S", "60"))
+SUMMARY_BACKFILL = os.getenv("SUMMARY_BACKFILL", "true").lower() in ("1", "true", "yes")
+SUMMARY_BACKFILL_MAX = int(os.getenv("SUMMARY_BACKFILL_MAX", str(LLM_MAX_CONCURRENCY)))
+
+# LI.FI circuit breaker: opens for UPSTREAM_BREAKER_OPEN_S seconds once UPSTREAM_BREAKER_FAILURE_RATE
+# of the last UPSTREAM_BREAKER_WINDOW calls failed or took longer than UPSTREAM_BREAKER_SLOW_CALL_S.
+UPSTREAM_BREAKER_WINDOW = int(os.getenv("UPSTREAM_BREAKER_WINDOW", "20"))
+UPSTREAM_BREAKER_MIN_CALLS = int(os.getenv("UPSTREAM_BREAKER_MIN_CALLS", "10"))
+UPSTREAM_BREAKER_FAILURE_RATE = float(os.getenv("UPSTREAM_BREAKER_FAILURE_RATE", "0.5"))
+UPSTREAM_BREAKER_SLOW_CALL_S = float(os.getenv("UPSTREAM_BREAKER_SLOW_CALL_S", "5"))
+UPSTREAM_BREAKER_OPEN_S = float(os.getenv("UPSTREAM_BREAKER_OPEN_S", "15"))
+UPSTREAM_BREAKER_PROBES = int(os.getenv("UPSTREAM_BREAKER_PROBES", "2"))
+
+# Adaptive (AIMD) limit on concurrent LI.FI calls, between UPSTREAM_LIMIT_MIN and UPSTREAM_LIMIT_MAX.
+UPSTREAM_LIMIT_INITIAL = float(os.getenv("UPSTREAM_LIMIT_INITIAL", "20"))
+UPSTREAM_LIMIT_MIN = int(os.getenv("UPSTREAM_LIMIT_MIN", "2"))
+UPSTREAM_LIMIT_MAX = int(os.getenv("UPSTREAM_LIMIT_MAX", "100"))
+UPSTREAM_LIMIT_LATENCY_TARGET_S = float(os.getenv("UPSTREAM_LIMIT_LATENCY_TARGET_S", "2"))
+UPSTREAM_LIMIT_QUEUE_TIMEOUT_S = float(os.getenv("UPSTREAM_LIMIT_QUEUE_TIMEOUT_S", "2"))
+
+# Request hedging: when enabled, a LI.FI call still unanswered after the UPSTREAM_HEDGE_PERCENTILE
+# of recent upstream latency gets a second identical request; the first answer wins. Hedges are
+# capped at UPSTREAM_HEDGE_BUDGET extra load (0.05 = 5%).
+UPSTREAM_HEDGE = os.getenv("UPSTREAM_HEDGE", "false").lower() in ("1", "true", "yes")
+UPSTREAM_HEDGE_PERCENTILE = float(os.getenv("UPSTREAM_HEDGE_PERCENTILE", "95"))
+UPSTREAM_HEDGE_BUDGET = float(os.getenv("UPSTREAM_HEDGE_BUDGET", "0.05"))
+
+# Cache warmer: every CACHE_WARM_INTERVAL_S seconds, re-fetch hot quotes that would otherwise
+# expire before the next pass. Hot quotes are the CACHE_WARM_TOP_N most requested keys plus every
+# CACHE_WARM_PAIRS entry ("FROMCHAIN:TOCHAIN:FROMTOKEN:TOTOKEN", comma-separated) at each of
+# CACHE_WARM_AMOUNTS (in whole tokens). Refreshes are spread over the interval with
+# CACHE_WARM_JITTER relative jitter. Request frequencies are only tracked while the warmer is on,
+# for at most CACHE_WARM_TRACK_MAX keys.
+CACHE_WARM = os.getenv("CACHE_WARM", "false").lower() in ("1", "true", "yes")
+CACHE_WARM_INTERVAL_S = float(os.getenv("CACHE_WARM_INTERVAL_S", str(QUOTE_CACHE_TTL / 2)))
+CACHE_WARM_TOP_N = int(os.getenv("CACHE_WARM_TOP_N", "20"))
+CACHE_WARM_TRACK_MAX = int(os.getenv("CACHE_WARM_TRACK_MAX", "10000"))
+CACHE_WARM_PAIRS = [p.strip() for p in os.getenv("CACHE_WARM_PAIRS", "").split(",") if p.strip()]
+CACHE_WARM_AMOUNTS = [float(a) for a in os.getenv("CACHE_WARM_AMOUNTS", "50,100,500,1000,5000").split(",")]
+CACHE_WARM_JITTER = float(os.getenv("CACHE_WARM_JITTER", "0.3"))
+
+# Token decimals used to turn CACHE_WARM_AMOUNTS into fromAmount (same table as the frontend).
+TOKEN_DECIMALS = {"USDC": 6, "USDT": 6, "ETH": 18, "WBTC": 8}
+
+# Batch quotes: maximum items per POST /api/v1/quotes and concurrent LI.FI fetches per batch.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_FETCH_CONCURRENCY = int(os.getenv("BATCH_FETCH_CONCURRENCY", "8"))
+
+# Route comparison (/api/v1/routes): how long parsed LI.FI route candidates are cached, and the
+# default and maximum number of ranked routes returned.
+ROUTES_CACHE_SIZE = int(os.getenv("ROUTES_CACHE_SIZE", "512"))
+ROUTES_CACHE_TTL = float(os.getenv("ROUTES_CACHE_TTL", str(QUOTE_CACHE_TTL)))
+ROUTES_TOP_K = int(os.getenv("ROUTES_TOP_K", "3"))
+ROUTES_MAX_TOP_K = int(os.getenv("ROUTES_MAX_TOP_K", "50"))
+
+# LI.FI's advanced routes endpoint takes numeric chain ids rather than chain keys. Used when the
+# token index below has no entry (e.g. before its first refresh).
+CHAIN_IDS = {"ETH": 1, "OPT": 10, "POL": 137, "BASE": 8453, "BAS": 8453, "ARB": 42161}
+
+# Local index of LI.FI chains and tokens (TOKEN_INDEX_PATH.chains.npy / .tokens.npy), refreshed
+# from /v1/chains and /v1/tokens every TOKEN_INDEX_REFRESH_S seconds. Quote requests naming an
+# unknown chain or token symbol are rejected with 400 before any upstream call.
+TOKEN_INDEX = os.getenv("TOKEN_INDEX", "true").lower() in ("1", "true", "yes")
+TOKEN_INDEX_PATH = os.getenv("TOKEN_INDEX_PATH", "token_index")
+TOKEN_INDEX_REFRESH_S = float(os.getenv("TOKEN_INDEX_REFRESH_S", "21600"))
+
+# Append-only journal of served quotes (rotating zstd-compressed JSONL segments in
+# QUOTE_JOURNAL_DIR), written in batches by a background task. When its queue is full, "drop"
+# discards the record and "block" makes the request wait for room.
+QUOTE_JOURNAL = os.getenv("QUOTE_JOURNAL", "false").lower() in ("1", "true", "yes")
+QUOTE_JOURNAL_DIR = os.getenv("QUOTE_JOURNAL_DIR", "journal")
+QUOTE_JOURNAL_QUEUE_SIZE = int(os.getenv("QUOTE_JOURNAL_QUEUE_SIZE", "10000"))
+QUOTE_JOURNAL_BATCH_SIZE = int(os.getenv("QUOTE_JOURNAL_BATCH_SIZE", "500"))
+QUOTE_JOURNAL_FLUSH_S = float(os.getenv("QUOTE_JOURNAL_FLUSH_S", "1"))
+QUOTE_JOURNAL_SEGMENT_MB = float(os.getenv("QUOTE_JOURNAL_SEGMENT_MB", "64"))
+QUOTE_JOURNAL_SEGMENT_S = float(os.getenv("QUOTE_JOURNAL_SEGMENT_S", "3600"))
+QUOTE_JOURNAL_BACKPRESSURE = os.getenv("QUOTE_JOURNAL_BACKPRESSURE", "drop").lower()
+
+# Record every LI.FI and OpenAI request/response pair to TRAFFIC_RECORD_DIR, or answer them from
+# the recordings in TRAFFIC_REPLAY_DIR with the recorded latencies times
+# TRAFFIC_REPLAY_LATENCY_SCALE (0 answers immediately). See recording.py.
+TRAFFIC_RECORD_DIR = os.getenv("TRAFFIC_RECORD_DIR", "")
+TRAFFIC_REPLAY_DIR = os.getenv("TRAFFIC_REPLAY_DIR", "")
+TRAFFIC_REPLAY_LATENCY_SCALE = float(os.getenv("TRAFFIC_REPLAY_LATENCY_SCALE", "1"))
+
 
 # --- 2. Initialize Application and AI Components ---
 
 # Create an instance of the FastAPI class, which is our backend server.
-app = FastAPI(title="ChainCompass API")
+# ORJSONResponse encodes every JSON response with orjson instead of the stdlib encoder.
+app = FastAPI(title="ChainCompass API", default_response_class=ORJSONResponse)
 
 # Enable CORS for local dev and deployed frontend
 allowed_origins = [
@@ -54,50 +196,371 @@ app.add_middleware(
 # Enable gzip compression for faster responses
 app.add_middleware(GZipMiddleware, minimum_size=500)
 
-# Initialize the OpenAI model we want to use (gpt-4o-mini for speed and cost).
-# We wrap the API key in SecretStr to resolve the type warning.
-llm = ChatOpenAI(model="gpt-4o-mini", api_key=SecretStr(OPENAI_API_KEY))
-
 # This is the prompt template for our AI. It defines the AI's persona and instructions.
 # The fields in {curly_braces} will be filled in with data from the LI.FI quote.
-prompt = ChatPromptTemplate.from_template(
+PROMPT_TEMPLATE = (
     "You are a helpful crypto assistant called ChainCompass. "
     "Summarize the following best route for a user in a friendly, single sentence. "
     "Mention the provider, the estimated time, the final amount in USD, and the fees. "
     "Route details: Provider={provider}, Time={time_seconds}s, Fees of approximately ${fees_usd:.2f} USD, resulting in a final amount of ${output_usd:.2f} USD."
 )
 
-# This creates a "chain" that links the prompt and the AI model together.
-# When we call this chain, the data flows from the prompt to the model automatically.
-chain = prompt | llm
+# The OpenAI model (gpt-4o-mini for speed and cost), the prompt and the "chain" linking them are
+# built by get_chain() on first use, or by the startup warm-up, so that importing
+# langchain_openai does not delay the process start and /health answers immediately.
+llm = None
+prompt = None
+chain = None
+_chain_lock = threading.Lock()
+
+
+def get_chain():
+    """Build llm, prompt and chain once (thread-safe) and return the chain."""
+    global llm, prompt, chain
+    if chain is None:
+        with _chain_lock:
+            if chain is None:
+                from langchain_core.prompts import ChatPromptTemplate
+
+                if prompt is None:
+                    prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+                if llm is None:
+                    from langchain_openai import ChatOpenAI
+
+                    client_kwargs = {}
+                    if TRAFFIC_RECORD_DIR or replay_store is not None:
+                        client_kwargs["http_async_client"] = httpx.AsyncClient(
+                            transport=upstream_transport("openai", httpx.AsyncHTTPTransport())
+                        )
+                    # We wrap the API key in SecretStr to resolve the type warning.
+                    llm = ChatOpenAI(model="gpt-4o-mini", api_key=SecretStr(OPENAI_API_KEY), **client_kwargs)
+                # When we call this chain, the data flows from the prompt to the model automatically.
+                chain = prompt | llm
+    return chain
+
+
+async def ensure_chain():
+    """The chain, building it in a worker thread if needed so the event loop keeps serving."""
+    return chain if chain is not None else await asyncio.to_thread(get_chain)
+
+# Bounds concurrent LLM calls; queue-wait statistics help size LLM_MAX_CONCURRENCY.
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+llm_stats: Dict[str, float] = {
+    "calls": 0,
+    "waiting": 0,
+    "in_flight": 0,
+    "timeouts": 0,
+    "queue_wait_total_s": 0.0,
+    "queue_wait_max_s": 0.0,
+}
+# End-to-end LLM call latency (queue wait included) for the LLM_SLO_P95_S check
+llm_latency = LatencyWindow(window_s=LLM_SLO_WINDOW_S)
+
+# Guards around every LI.FI call (see resilience.py)
+upstream_breaker = CircuitBreaker(
+    window=UPSTREAM_BREAKER_WINDOW,
+    min_calls=UPSTREAM_BREAKER_MIN_CALLS,
+    failure_rate=UPSTREAM_BREAKER_FAILURE_RATE,
+    slow_call_s=UPSTREAM_BREAKER_SLOW_CALL_S,
+    open_s=UPSTREAM_BREAKER_OPEN_S,
+    probes=UPSTREAM_BREAKER_PROBES,
+)
+upstream_limiter = AdaptiveLimiter(
+    initial=UPSTREAM_LIMIT_INITIAL,
+    min_limit=UPSTREAM_LIMIT_MIN,
+    max_limit=UPSTREAM_LIMIT_MAX,
+    latency_target_s=UPSTREAM_LIMIT_LATENCY_TARGET_S,
+    queue_timeout_s=UPSTREAM_LIMIT_QUEUE_TIMEOUT_S,
+)
+upstream_hedger = Hedger(percentile=UPSTREAM_HEDGE_PERCENTILE, budget=UPSTREAM_HEDGE_BUDGET)
+
+# Prometheus metrics served at /metrics. Stages: request, cache_lookup, upstream_total,
+# upstream_attempt, parse, llm_queue, llm_generation.
+metrics_registry = Registry()
+stage_seconds = metrics_registry.histogram(
+    "chaincompass_stage_duration_seconds", "Time spent in each quote pipeline stage.", ["stage"]
+)
+quote_cache_events = metrics_registry.counter(
+    "chaincompass_quote_cache_events_total", "Quote cache hits, stale hits, approximate hits, misses and evictions.", ["event"]
+)
+upstream_responses = metrics_registry.counter(
+    "chaincompass_upstream_responses_total", "LI.FI responses by HTTP status, or transport error name.", ["status"]
+)
+upstream_retries = metrics_registry.counter(
+    "chaincompass_upstream_retries_total", "LI.FI fetch attempts beyond the first."
+)
+llm_errors = metrics_registry.counter(
+    "chaincompass_llm_errors_total", "Failed LLM calls by kind (timeout or error).", ["kind"]
+)
+upstream_rejections = metrics_registry.counter(
+    "chaincompass_upstream_rejections_total", "LI.FI calls refused locally (circuit_open or limit).", ["reason"]
+)
+upstream_hedges = metrics_registry.counter(
+    "chaincompass_upstream_hedges_total", "Hedged LI.FI requests by outcome (sent, won, over_budget).", ["outcome"]
+)
+summary_degraded = metrics_registry.counter(
+    "chaincompass_summary_degraded_total",
+    "Template summaries served instead of the LLM, by reason (budget_exceeded, slo_exceeded, llm_error).",
+    ["reason"],
+)
+summary_backfills = metrics_registry.counter(
+    "chaincompass_summary_backfills_total", "LLM summaries stored in summary_cache after a template was served."
+)
+summary_backfills_dropped = metrics_registry.counter(
+    "chaincompass_summary_backfills_dropped_total", "Backfills not run because SUMMARY_BACKFILL_MAX were outstanding."
+)
+upstream_breaker_state = metrics_registry.gauge(
+    "chaincompass_upstream_breaker_state", "LI.FI circuit breaker state: 0 closed, 1 half-open, 2 open."
+)
+upstream_limit = metrics_registry.gauge(
+    "chaincompass_upstream_concurrency_limit", "Current adaptive limit on concurrent LI.FI calls."
+)
+upstream_in_flight = metrics_registry.gauge(
+    "chaincompass_upstream_in_flight", "LI.FI calls currently in flight."
+)
 
 
 # --- 3. Helper Functions ---
 
+T = TypeVar("T")
+
 def parse_quote(quote_data):
     """
     This function takes the large, complex JSON response from LI.FI
     and extracts only the key pieces of information we care about.
+    It is a single-row view of the columnar parse_quotes(); use that directly for many quotes.
     """
-    estimate = quote_data.get("estimate", {})
-    tool_details = quote_data.get("toolDetails", {})
-    provider_name = tool_details.get("name", "N/A")
-    execution_time_seconds = estimate.get("executionDuration", 0)
-    final_output_usd = estimate.get("toAmountUSD", "0")
-    
-    # Calculate the total fees by adding up all fee costs.
-    total_fees_usd = 0
-    for fee in estimate.get("feeCosts", []):
-        total_fees_usd += float(fee.get("amountUSD", "0"))
-        
-    # Return a clean, simple dictionary with our extracted data.
-    summary = {
-        "provider": provider_name,
-        "time_seconds": execution_time_seconds,
-        "fees_usd": total_fees_usd,
-        "output_usd": float(final_output_usd)
-    }
-    return summary
+    return parse_quotes([quote_data]).row(0)
+
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+
+
+class QuoteRecord(NamedTuple):
+    """
+    The part of a LI.FI quote the API serves, kept in quote_cache instead of the full
+    response dict. raw optionally holds the zstd-compressed upstream body for debugging.
+    """
+    provider: str
+    time_seconds: int
+    fees_usd: float
+    output_usd: float
+    raw: Optional[bytes] = None
+
+    @classmethod
+    def from_response(cls, content: bytes, keep_raw: bool = False) -> "QuoteRecord":
+        summary = parse_quote(orjson.loads(content))
+        raw = None
+        if keep_raw:
+            # compress() returns a bytes object sized for the worst case; copy to drop the slack.
+            raw = bytes(memoryview(_zstd_compressor.compress(content)))
+        return cls(raw=raw, **summary)
+
+    def summary(self) -> dict:
+        """The parse_quote-shaped dict used for the LLM prompt and summary cache."""
+        return {
+            "provider": self.provider,
+            "time_seconds": self.time_seconds,
+            "fees_usd": self.fees_usd,
+            "output_usd": self.output_usd,
+        }
+
+    def raw_quote(self) -> Optional[dict]:
+        """Decompress and decode the original LI.FI response, if it was kept."""
+        if self.raw is None:
+            return None
+        return orjson.loads(zstandard.ZstdDecompressor().decompress(self.raw))
+
+
+def dump_quote_entry(entry: tuple) -> bytes:
+    """Serialize a (fetched_at, origin, QuoteRecord) cache entry for shared cache backends."""
+    fetched_at, origin, record = entry
+    raw = base64.b64encode(record.raw).decode() if record.raw is not None else None
+    return orjson.dumps([fetched_at, origin, *record[:4], raw])
+
+
+def load_quote_entry(data: bytes) -> tuple:
+    fetched_at, origin, provider, time_seconds, fees_usd, output_usd, raw = orjson.loads(data)
+    raw = base64.b64decode(raw) if raw is not None else None
+    return fetched_at, origin, QuoteRecord(provider, time_seconds, fees_usd, output_usd, raw)
+
+
+def _bucket_usd(value: float) -> float:
+    """Snap a USD amount to its summary-cache bucket."""
+    if SUMMARY_CACHE_BUCKET_PCT > 0 and value > 0:
+        step = math.log1p(SUMMARY_CACHE_BUCKET_PCT / 100)
+        return round(math.exp(round(math.log(value) / step) * step), SUMMARY_CACHE_ROUND_DIGITS)
+    return round(value, SUMMARY_CACHE_ROUND_DIGITS)
+
+
+def summary_cache_key(clean_summary: dict) -> tuple:
+    """Key the LLM summary cache on the parsed route fields the prompt actually uses."""
+    return (
+        clean_summary.get("provider"),
+        clean_summary.get("time_seconds"),
+        _bucket_usd(clean_summary.get("fees_usd", 0.0)),
+        _bucket_usd(clean_summary.get("output_usd", 0.0)),
+    )
+
+
+@asynccontextmanager
+async def llm_slot():
+    """Wait for a free LLM slot, recording queue-wait statistics."""
+    queued_at = time.perf_counter()
+    llm_stats["waiting"] += 1
+    try:
+        await llm_semaphore.acquire()
+    finally:
+        llm_stats["waiting"] -= 1
+    wait = time.perf_counter() - queued_at
+    stage_seconds.observe(wait, "llm_queue")
+    llm_stats["queue_wait_total_s"] += wait
+    llm_stats["queue_wait_max_s"] = max(llm_stats["queue_wait_max_s"], wait)
+    llm_stats["calls"] += 1
+    llm_stats["in_flight"] += 1
+    try:
+        yield
+    finally:
+        llm_stats["in_flight"] -= 1
+        llm_semaphore.release()
+
+
+async def summarize(clean_summary: dict) -> str:
+    """Run the LLM chain natively async, bounded by llm_semaphore and LLM_TIMEOUT."""
+    llm_chain = await ensure_chain()
+    started = time.perf_counter()
+    async with llm_slot():
+        try:
+            with stage_seconds.time("llm_generation"):
+                ai_response = await asyncio.wait_for(llm_chain.ainvoke(clean_summary), timeout=LLM_TIMEOUT)
+        except asyncio.TimeoutError:
+            llm_latency.observe(time.perf_counter() - started)
+            llm_stats["timeouts"] += 1
+            llm_errors.inc("timeout")
+            raise HTTPException(status_code=504, detail="LLM summary timed out")
+        except Exception as err:
+            llm_errors.inc("error")
+            raise HTTPException(status_code=502, detail=f"LLM failure: {str(err)}")
+    llm_latency.observe(time.perf_counter() - started)
+    return ai_response.content
+
+
+def template_summary(clean_summary: dict) -> str:
+    """A deterministic one-sentence summary of the parse_quote fields, used instead of the LLM."""
+    seconds = int(clean_summary.get("time_seconds") or 0)
+    duration = f"{seconds} seconds" if seconds < 120 else f"{round(seconds / 60)} minutes"
+    return (
+        f"The best route is via {clean_summary.get('provider', 'N/A')}, taking about {duration} "
+        f"with fees of approximately ${clean_summary.get('fees_usd', 0):.2f} USD, "
+        f"resulting in a final amount of ${clean_summary.get('output_usd', 0):.2f} USD."
+    )
+
+
+# LLM summaries in progress for summarize_within_slo, keyed on summary_key, so identical keys share
+# one call; the requests still waiting on each; and the keys whose request already got a template
+# and that will fill summary_cache.
+pending_summaries: Dict[tuple, "asyncio.Future[str]"] = {}
+summary_waiters: Dict["asyncio.Future[str]", int] = {}
+backfilling: set = set()
+
+
+def _summary_done(summary_key: tuple, task: "asyncio.Future[str]") -> None:
+    if pending_summaries.get(summary_key) is task:
+        del pending_summaries[summary_key]
+    backfill = summary_key in backfilling
+    backfilling.discard(summary_key)
+    if task.cancelled() or task.exception() is not None:
+        return
+    summary_cache[summary_key] = task.result()
+    if backfill:
+        summary_backfills.inc()
+
+
+def _pending_summary(clean_summary: dict, summary_key: tuple) -> "asyncio.Future[str]":
+    """The in-progress LLM summary for summary_key, starting one if there is none."""
+    task = pending_summaries.get(summary_key)
+    if task is None:
+        task = asyncio.ensure_future(summarize(clean_summary))
+        pending_summaries[summary_key] = task
+        task.add_done_callback(lambda t, key=summary_key: _summary_done(key, t))
+    return task
+
+
+def _can_backfill(summary_key: tuple) -> bool:
+    if not SUMMARY_BACKFILL:
+        return False
+    if summary_key in backfilling:
+        return True
+    if len(backfilling) >= SUMMARY_BACKFILL_MAX:
+        summary_backfills_dropped.inc()
+        return False
+    backfilling.add(summary_key)
+    return True
+
+
+async def summarize_within_slo(clean_summary: dict, summary_key: tuple, started: float) -> Tuple[str, str]:
+    """
+    Summarize via the LLM, falling back to template_summary() when the answer would miss the
+    request's latency budget, the LLM's recent p95 is over LLM_SLO_P95_S, or the LLM fails.
+    Returns (summary, source) with source "llm" or "template".
+    """
+    if not QUOTE_LATENCY_BUDGET_S and not LLM_SLO_P95_S:
+        ai_summary = await summarize(clean_summary)
+        summary_cache[summary_key] = ai_summary
+        return ai_summary, "llm"
+
+    p95 = llm_latency.percentile(95) if LLM_SLO_P95_S else None
+    remaining = QUOTE_LATENCY_BUDGET_S - (time.perf_counter() - started) if QUOTE_LATENCY_BUDGET_S else None
+    if p95 is not None and p95 > LLM_SLO_P95_S:
+        reason = "slo_exceeded"
+        # Queue a backfill unless one is already queued for this key or too many are outstanding.
+        if summary_key not in pending_summaries and _can_backfill(summary_key):
+            _pending_summary(clean_summary, summary_key)
+    else:
+        task = _pending_summary(clean_summary, summary_key)
+        reason = "budget_exceeded"
+        if remaining is None or remaining > 0:
+            summary_waiters[task] = summary_waiters.get(task, 0) + 1
+            try:
+                done, _ = await asyncio.wait({task}, timeout=remaining)
+            finally:
+                summary_waiters[task] -= 1
+                if not summary_waiters[task]:
+                    del summary_waiters[task]
+            if done and not task.cancelled():
+                if task.exception() is None:
+                    return task.result(), "llm"
+                reason = "llm_error"
+        # The call is shared with any request still waiting on it: only the last one cancels it.
+        if reason == "budget_exceeded" and task not in summary_waiters and not _can_backfill(summary_key):
+            task.cancel()
+
+    summary_degraded.inc(reason)
+    return template_summary(clean_summary), "template"
+
+
+async def stream_summary(clean_summary: dict) -> AsyncIterator[str]:
+    """Yield summary tokens from chain.astream, bounded like summarize()."""
+    llm_chain = await ensure_chain()
+    async with llm_slot():
+        started = time.perf_counter()
+        deadline = started + LLM_TIMEOUT
+        chunks = llm_chain.astream(clean_summary).__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=deadline - time.perf_counter())
+            except StopAsyncIteration:
+                stage_seconds.observe(time.perf_counter() - started, "llm_generation")
+                return
+            except asyncio.TimeoutError:
+                llm_stats["timeouts"] += 1
+                llm_errors.inc("timeout")
+                raise HTTPException(status_code=504, detail="LLM summary timed out")
+            except Exception:
+                llm_errors.inc("error")
+                raise
+            if chunk.content:
+                yield chunk.content
 
 
 # --- 4. API Endpoints ---
@@ -109,34 +572,145 @@ def read_root():
 
 @app.get("/health")
 async def health() -> dict:
+    """Liveness: answers as soon as the process serves HTTP, without touching any dependency."""
     return {"status": "ok"}
 
+@app.get("/ready")
+async def ready() -> ORJSONResponse:
+    """Readiness: 200 once the LI.FI client and the LLM chain are initialized, 503 until then."""
+    checks = {"http_client": async_client is not None, "llm": chain is not None}
+    ok = all(checks.values())
+    checks["token_index"] = token_index.ready
+    return ORJSONResponse({"status": "ready" if ok else "starting", "checks": checks}, status_code=200 if ok else 503)
+
 # Shared HTTP client with connection pooling
 async_client: Optional[httpx.AsyncClient] = None
+llm_warmup_task: Optional["asyncio.Task[None]"] = None
+
+async def warm_llm() -> None:
+    try:
+        await ensure_chain()
+    except Exception as err:
+        print(f"⚠️ LLM initialization failed: {err}")
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    global async_client
+    global async_client, llm_warmup_task, cache_warmer_task, token_index_task
+    if TRAFFIC_RECORD_DIR:
+        traffic_recorder.start()
     async_client = httpx.AsyncClient(
-        base_url="https://li.quest",
+        base_url=LIFI_BASE_URL,
         timeout=httpx.Timeout(15.0, read=15.0, connect=10.0),
         headers={
             "accept": "application/json",
             "x-lifi-api-key": LIFI_API_KEY,
         },
         limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
-        transport=httpx.AsyncHTTPTransport(retries=0)
+        transport=upstream_transport("lifi", httpx.AsyncHTTPTransport(retries=0)),
     )
+    # Build the LLM chain in the background; the first summary waits for it if it isn't done.
+    llm_warmup_task = asyncio.create_task(warm_llm())
+    if CACHE_WARM:
+        cache_warmer_task = asyncio.create_task(run_cache_warmer())
+    if TOKEN_INDEX:
+        token_index_task = asyncio.create_task(run_token_index_refresher())
+    if QUOTE_JOURNAL:
+        quote_journal.start()
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
-    global async_client
+    global async_client, llm_warmup_task, cache_warmer_task, token_index_task
+    if llm_warmup_task is not None:
+        llm_warmup_task.cancel()
+        llm_warmup_task = None
+    if cache_warmer_task is not None:
+        cache_warmer_task.cancel()
+        cache_warmer_task = None
+    if token_index_task is not None:
+        token_index_task.cancel()
+        token_index_task = None
+    await quote_journal.close()
     if async_client is not None:
         await async_client.aclose()
         async_client = None
+    await traffic_recorder.close()
+
+# Chain/token metadata, memory-mapped from the last snapshot so validation works from startup
+token_index = TokenIndex(TOKEN_INDEX_PATH)
+if TOKEN_INDEX:
+    token_index.load()
+token_index_task: Optional["asyncio.Task[None]"] = None
+token_index_stats: Dict[str, float] = {"refreshes": 0, "failures": 0, "last_refresh_s": 0.0}
+
+# TTL cache for quotes (process-local or shared, see QUOTE_CACHE_BACKEND)
+quote_cache: CacheBackend = make_cache(
+    QUOTE_CACHE_BACKEND,
+    maxsize=QUOTE_CACHE_SIZE,
+    ttl=QUOTE_CACHE_TTL,
+    path=QUOTE_CACHE_PATH,
+    dumps=dump_quote_entry,
+    loads=load_quote_entry,
+)
+
+# Sorted cached fromAmounts per (chains, tokens, address) pair, for approximate reuse. A pair
+# holds at most QUOTE_CACHE_SIZE amounts; see index_amount().
+amount_index: TTLCache = TTLCache(maxsize=QUOTE_CACHE_SIZE, ttl=QUOTE_CACHE_TTL)
+
+# Request frequency per cache_key (CACHE_WARM only), halved after each warmer pass so it tracks
+# recent traffic
+request_counts: Counter = Counter()
+warm_stats: Dict[str, float] = {"passes": 0, "refreshes": 0, "failures": 0, "keys": 0, "last_pass_s": 0.0}
+cache_warmer_task: Optional["asyncio.Task[None]"] = None
+
+# Background revalidations of stale quote_cache entries, one per cache_key
+revalidating: Dict[tuple, "asyncio.Task[None]"] = {}
+swr_stats: Dict[str, int] = {"stale_served": 0, "refreshes": 0, "refresh_failures": 0}
 
-# In-memory TTL cache for quotes
-quote_cache: TTLCache = TTLCache(maxsize=1000, ttl=60)
+# LRU + TTL cache of LLM summaries keyed on bucketed parse_quote output
+summary_cache: TTLCache = TTLCache(maxsize=SUMMARY_CACHE_SIZE, ttl=SUMMARY_CACHE_TTL)
+summary_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+# Parsed LI.FI route candidates (NumPy columns) keyed on cache_key, for /api/v1/routes
+routes_cache: TTLCache = TTLCache(maxsize=ROUTES_CACHE_SIZE, ttl=ROUTES_CACHE_TTL)
+
+# Sliding 1m/1h/24h rollups of served quotes per chain, token and provider, for /api/v1/stats
+quote_rollups = QuoteRollups()
+
+# Served-quote journal; started on startup when QUOTE_JOURNAL is enabled
+quote_journal = QuoteJournal(
+    QUOTE_JOURNAL_DIR,
+    queue_size=QUOTE_JOURNAL_QUEUE_SIZE,
+    batch_size=QUOTE_JOURNAL_BATCH_SIZE,
+    flush_interval_s=QUOTE_JOURNAL_FLUSH_S,
+    segment_bytes=int(QUOTE_JOURNAL_SEGMENT_MB * 1024 * 1024),
+    segment_s=QUOTE_JOURNAL_SEGMENT_S,
+    backpressure=QUOTE_JOURNAL_BACKPRESSURE,
+)
+
+# Upstream traffic recorder (started on startup when TRAFFIC_RECORD_DIR is set) and replay store
+traffic_recorder = QuoteJournal(TRAFFIC_RECORD_DIR or "recordings", prefix="upstream", backpressure="block")
+replay_store: Optional[ReplayStore] = ReplayStore.load(TRAFFIC_REPLAY_DIR) if TRAFFIC_REPLAY_DIR else None
+
+
+def upstream_transport(upstream: str, transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """The transport for an upstream ("lifi" or "openai"): replayed, recorded, or transport itself."""
+    if replay_store is not None:
+        return ReplayTransport(replay_store, upstream, TRAFFIC_REPLAY_LATENCY_SCALE)
+    if TRAFFIC_RECORD_DIR:
+        return RecordingTransport(transport, traffic_recorder, upstream)
+    return transport
+
+# In-flight quote builds keyed on cache_key, so concurrent identical requests coalesce
+inflight_quotes: Dict[tuple, "asyncio.Future[QuoteSummary]"] = {}
+coalesce_stats: Dict[str, int] = {"coalesced": 0}
+
+
+def _release_inflight(cache_key: tuple, task: "asyncio.Future[QuoteSummary]") -> None:
+    """Drop a finished build from the in-flight map and mark its error as observed."""
+    if inflight_quotes.get(cache_key) is task:
+        del inflight_quotes[cache_key]
+    if not task.cancelled():
+        task.exception()
 
 # Request/Response models
 class QuoteRequest(BaseModel):
@@ -155,23 +729,49 @@ class QuoteSummary(BaseModel):
     time_seconds: Optional[int] = None
     fees_usd: Optional[float] = None
     output_usd: Optional[float] = None
+    cache_status: Optional[str] = None
+    summary_source: Optional[str] = None
 
-@app.get("/api/v1/quote", response_model=QuoteSummary)
-async def get_lifi_quote(
+class RouteCandidate(BaseModel):
+    rank: int
+    id: str
+    providers: str
+    output_usd: float
+    fees_usd: float
+    gas_usd: float
+    time_seconds: int
+    score: float
+
+class RouteComparison(BaseModel):
+    strategy: str
+    weights: Dict[str, float]
+    candidates: int
+    routes: List[RouteCandidate]
+
+class TokenMetadata(BaseModel):
+    chain: str
+    chainId: Optional[int] = None
+    symbol: str
+    address: Optional[str] = None
+    decimals: int
+
+class BatchQuoteItem(BaseModel):
+    request: QuoteRequest
+    quote: Optional[QuoteSummary] = None
+    status_code: int = 200
+    error: Optional[str] = None
+
+def quote_request(
     fromChain: str = Query(..., min_length=2, max_length=10),
     toChain: str = Query(..., min_length=2, max_length=10),
     fromToken: str = Query(..., min_length=2, max_length=12),
     toToken: str = Query(..., min_length=2, max_length=12),
     fromAmount: str = Query(..., pattern=r"^\d{1,30}$"),
     fromAddress: Optional[str] = Query("0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045")
-):
-    """
-    Fetch LI.FI quote (pooled async client + TTL cache + retries) and summarize via LLM.
-    """
-    global async_client
+) -> QuoteRequest:
+    """Build a QuoteRequest from query parameters (shared by the quote endpoints)."""
     if async_client is None:
         raise HTTPException(status_code=503, detail="HTTP client not ready")
-
     req = QuoteRequest(
         fromChain=fromChain,
         toChain=toChain,
@@ -180,40 +780,425 @@ async def get_lifi_quote(
         fromAmount=fromAmount,
         fromAddress=fromAddress,
     )
+    validate_quote_request(req)
+    return req
+
+
+def resolve_chain(chain: str) -> Optional[int]:
+    """LI.FI chain id for a chain key, name or id, from the token index or CHAIN_IDS."""
+    chain_id = token_index.chain_id(chain)
+    return chain_id if chain_id is not None else CHAIN_IDS.get(chain.upper())
+
+
+def resolve_token(chain: str, token: str) -> Optional[TokenInfo]:
+    chain_id = resolve_chain(chain)
+    return None if chain_id is None else token_index.token(chain_id, token)
+
+
+def validate_quote_request(req: QuoteRequest) -> None:
+    """
+    Reject unknown chains and token symbols locally with 400. Token addresses missing from
+    the index are let through (LI.FI may still route them), and nothing is rejected until
+    the index has been loaded.
+    """
+    if not token_index.ready:
+        return
+    for side, chain, token in (("from", req.fromChain, req.fromToken), ("to", req.toChain, req.toToken)):
+        if resolve_chain(chain) is None:
+            raise HTTPException(status_code=400, detail=f"Unknown {side}Chain: {chain}")
+        if resolve_token(chain, token) is None and not (token.startswith("0x") and len(token) == 42):
+            raise HTTPException(status_code=400, detail=f"Unknown {side}Token {token} on {chain}")
+
+
+def token_decimals(chain: str, token: str) -> int:
+    info = resolve_token(chain, token)
+    return info.decimals if info is not None else TOKEN_DECIMALS.get(token.upper(), 18)
+
+
+def quote_cache_key(req: QuoteRequest) -> tuple:
+    """Key for quote_cache and in-flight coalescing."""
+    return (req.fromChain, req.toChain, req.fromToken, req.toToken, req.fromAmount, req.fromAddress)
+
+
+def quote_request_from_key(cache_key: tuple) -> QuoteRequest:
+    from_chain, to_chain, from_token, to_token, from_amount, from_address = cache_key
+    return QuoteRequest(
+        fromChain=from_chain,
+        toChain=to_chain,
+        fromToken=from_token,
+        toToken=to_token,
+        fromAmount=from_amount,
+        fromAddress=from_address,
+    )
 
-    cache_key = (req.fromChain, req.toChain, req.fromToken, req.toToken, req.fromAmount, req.fromAddress)
 
-    if cache_key in quote_cache:
-        raw_quote_data = quote_cache[cache_key]
+@app.get("/api/v1/quote", response_model=QuoteSummary)
+async def get_lifi_quote(req: QuoteRequest = Depends(quote_request)):
+    """
+    Fetch LI.FI quote (pooled async client + TTL cache + retries) and summarize via LLM.
+    """
+    started = time.perf_counter()
+    cache_key = quote_cache_key(req)
+    if CACHE_WARM:
+        count_request(cache_key)
+
+    # Single-flight: identical concurrent requests share one upstream fetch and one summary.
+    task = inflight_quotes.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(build_quote(req, cache_key))
+        inflight_quotes[cache_key] = task
+        task.add_done_callback(lambda t, key=cache_key: _release_inflight(key, t))
     else:
-        async def fetch() -> dict:
-            resp = await async_client.get("/v1/quote", params=req.model_dump())
-            resp.raise_for_status()
-            return resp.json()
+        coalesce_stats["coalesced"] += 1
+
+    # shield() so a disconnecting caller does not cancel the work other waiters depend on.
+    with stage_seconds.time("request"):
+        result = await asyncio.shield(task)
+    served = result.model_dump()
+    record_served(req, served)
+    await quote_journal.append({
+        "ts": time.time(),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "cache_status": served.pop("cache_status"),
+        "request": req.model_dump(),
+        "quote": served,
+    })
+    return result
+
+
+def count_request(cache_key: tuple) -> None:
+    """Count a request for the cache warmer, keeping the most common half when over the cap."""
+    request_counts[cache_key] += 1
+    if len(request_counts) > CACHE_WARM_TRACK_MAX:
+        hot = request_counts.most_common(CACHE_WARM_TRACK_MAX // 2)
+        request_counts.clear()
+        request_counts.update(dict(hot))
+
+
+def record_served(req: QuoteRequest, clean_summary: dict) -> None:
+    """Count a served quote in the dashboard rollups (volume is the route's USD output)."""
+    quote_rollups.record(
+        req.fromChain,
+        req.fromToken,
+        clean_summary.get("provider") or "N/A",
+        clean_summary.get("output_usd") or 0.0,
+        clean_summary.get("time_seconds") or 0,
+    )
+
+
+async def hedged(fetch: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run fetch(); if it has not answered within the hedge delay and the hedge budget allows,
+    start a second fetch() and return whichever succeeds first, cancelling the other.
+    """
+    delay = upstream_hedger.delay()
+    if delay is None:
+        return await fetch()
+    primary = asyncio.ensure_future(fetch())
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return primary.result()
+        if not upstream_hedger.try_spend():
+            upstream_hedges.inc("over_budget")
+            return await primary
+        upstream_hedges.inc("sent")
+        hedge = asyncio.ensure_future(fetch())
+        tasks.add(hedge)
+        error: Optional[BaseException] = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        upstream_hedges.inc("won")
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def upstream_call(method: str, url: str, **kwargs) -> httpx.Response:
+    """One LI.FI call behind the concurrency limiter and circuit breaker; raises on HTTP errors."""
+    # Take a limiter slot before asking the breaker, so a queued call never holds a probe.
+    try:
+        await upstream_limiter.acquire()
+    except ConcurrencyLimitExceeded:
+        upstream_rejections.inc("limit")
+        raise
+    try:
+        upstream_breaker.before_call()
+    except CircuitOpenError:
+        upstream_limiter.release_unused()
+        upstream_rejections.inc("circuit_open")
+        raise
+
+    started = time.perf_counter()
+    try:
+        resp = await async_client.request(method, url, **kwargs)
+    except asyncio.CancelledError:
+        upstream_breaker.abandon()
+        upstream_limiter.release_unused()
+        raise
+    except Exception as err:
+        latency = time.perf_counter() - started
+        stage_seconds.observe(latency, "upstream_attempt")
+        upstream_responses.inc(type(err).__name__)
+        upstream_breaker.record(False, latency)
+        upstream_limiter.release(False, latency)
+        raise
+    latency = time.perf_counter() - started
+    stage_seconds.observe(latency, "upstream_attempt")
+    # 4xx answers mean li.quest is healthy and the request itself was bad.
+    ok = resp.status_code < 500 and resp.status_code != 429
+    upstream_breaker.record(ok, latency)
+    upstream_limiter.release(ok, latency)
+    if ok:
+        upstream_hedger.observe(latency)
+    upstream_responses.inc(str(resp.status_code))
+    resp.raise_for_status()
+    return resp
+
+
+async def call_lifi(fetch: Callable[[], Awaitable[T]]) -> T:
+    """Run fetch() with retries (and hedging), mapping upstream failures to HTTP errors."""
+    started = time.perf_counter()
+    try:
+        async for attempt in AsyncRetrying(
+            reraise=True,
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
+            retry=retry_if_exception_type((httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError))
+        ):
+            if attempt.retry_state.attempt_number > 1:
+                upstream_retries.inc()
+            with attempt:
+                result = await hedged(fetch) if UPSTREAM_HEDGE else await fetch()
+    except CircuitOpenError as err:
+        raise HTTPException(
+            status_code=503,
+            detail="LI.FI is unavailable (circuit open), try again shortly",
+            headers={"Retry-After": str(math.ceil(err.retry_after))},
+        )
+    except ConcurrencyLimitExceeded as err:
+        raise HTTPException(status_code=503, detail=f"LI.FI is overloaded: {str(err)}")
+    except httpx.HTTPStatusError as err:
+        detail = err.response.text if err.response is not None else str(err)
+        status = err.response.status_code if err.response is not None else 502
+        raise HTTPException(status_code=status, detail=f"LI.FI error: {detail}")
+    except (httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError) as err:
+        raise HTTPException(status_code=504, detail=f"Upstream timeout: {str(err)}")
+    except Exception as err:
+        raise HTTPException(status_code=502, detail=f"Upstream failure: {str(err)}")
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, "upstream_total")
+    return result
+
+
+async def fetch_quote(req: QuoteRequest) -> QuoteRecord:
+    """Fetch a quote from LI.FI with retries, mapping upstream failures to HTTP errors."""
+    async def fetch() -> QuoteRecord:
+        resp = await upstream_call("GET", "/v1/quote", params=req.model_dump())
+        with stage_seconds.time("parse"):
+            return QuoteRecord.from_response(resp.content, keep_raw=QUOTE_CACHE_KEEP_RAW)
+
+    return await call_lifi(fetch)
+
+
+async def revalidate_quote(req: QuoteRequest, cache_key: tuple) -> None:
+    """Background refresh of a stale entry. On failure the stale entry stays until its hard TTL."""
+    try:
+        record = await fetch_quote(req)
+    except HTTPException:
+        swr_stats["refresh_failures"] += 1
+        return
+    store_quote(req, cache_key, record, "revalidated")
+    swr_stats["refreshes"] += 1
+
+
+def _schedule_revalidation(req: QuoteRequest, cache_key: tuple) -> None:
+    # While the breaker is open the stale entry is the best answer; don't queue doomed refreshes.
+    if cache_key in revalidating or upstream_breaker.is_open:
+        return
+    task = asyncio.ensure_future(revalidate_quote(req, cache_key))
+    revalidating[cache_key] = task
+    task.add_done_callback(lambda t, key=cache_key: revalidating.pop(key, None))
+
 
+def store_quote(req: QuoteRequest, cache_key: tuple, record: QuoteRecord, origin: str) -> None:
+    """Put a freshly fetched quote in quote_cache (and the approximate-reuse index)."""
+    quote_cache[cache_key] = (time.time(), origin, record)
+    if QUOTE_APPROX_TOLERANCE > 0:
+        index_amount(req)
+
+
+def _amount_pair(req: QuoteRequest) -> tuple:
+    return (req.fromChain, req.toChain, req.fromToken, req.toToken, req.fromAddress)
+
+
+def _amount_key(pair: tuple, amount: int) -> tuple:
+    """The quote_cache key of amount for an _amount_pair() pair."""
+    return pair[:4] + (str(amount), pair[4])
+
+
+def index_amount(req: QuoteRequest) -> None:
+    """
+    Record req.fromAmount as cached for its pair. When the pair's list outgrows QUOTE_CACHE_SIZE,
+    amounts whose quote has left quote_cache are dropped, then (should the cache still hold more)
+    those farthest from req.fromAmount, so a hot pair's list stays bounded by the quote cache.
+    """
+    pair = _amount_pair(req)
+    amounts = amount_index.get(pair) or []
+    amount = int(req.fromAmount)
+    i = bisect_left(amounts, amount)
+    if i == len(amounts) or amounts[i] != amount:
+        amounts.insert(i, amount)
+    if len(amounts) > QUOTE_CACHE_SIZE:
+        amounts[:] = [a for a in amounts if a == amount or _amount_key(pair, a) in quote_cache]
+        if len(amounts) > QUOTE_CACHE_SIZE:
+            i = bisect_left(amounts, amount)
+            start = min(max(i - QUOTE_CACHE_SIZE // 2, 0), len(amounts) - QUOTE_CACHE_SIZE)
+            amounts[:] = amounts[start:start + QUOTE_CACHE_SIZE]
+    amount_index[pair] = amounts  # re-set to refresh the pair's TTL
+
+
+def find_approximate(req: QuoteRequest) -> Optional[QuoteRecord]:
+    """
+    Return a fresh cached quote for the nearest cached fromAmount within QUOTE_APPROX_TOLERANCE,
+    with fees and output rescaled to the requested amount, or None.
+    """
+    pair = _amount_pair(req)
+    amounts = amount_index.get(pair)
+    if not amounts:
+        return None
+    amount = int(req.fromAmount)
+    i = bisect_left(amounts, amount)
+    for cached_amount in sorted(amounts[max(i - 1, 0):i + 1], key=lambda a: abs(a - amount)):
+        if abs(cached_amount - amount) > QUOTE_APPROX_TOLERANCE * cached_amount:
+            continue
+        entry = quote_cache.get(_amount_key(pair, cached_amount))
+        if entry is None:
+            amounts.remove(cached_amount)
+            continue
+        fetched_at, _, record = entry
+        if QUOTE_CACHE_SOFT_TTL > 0 and time.time() - fetched_at >= QUOTE_CACHE_SOFT_TTL:
+            continue
+        ratio = amount / cached_amount
+        return record._replace(fees_usd=record.fees_usd * ratio, output_usd=record.output_usd * ratio)
+    return None
+
+
+async def get_quote(req: QuoteRequest, cache_key: tuple) -> Tuple[QuoteRecord, str]:
+    """
+    Return the QuoteRecord for cache_key and its cache status: "miss" (fetched now),
+    "fresh", "revalidated" (fresh, refreshed in the background) or "stale" (past the soft
+    TTL; served immediately while one background task refreshes it). With
+    QUOTE_APPROX_TOLERANCE set, an exact miss may instead be served as "approximate".
+    """
+    with stage_seconds.time("cache_lookup"):
+        entry = quote_cache.get(cache_key)
+    if entry is not None:
+        fetched_at, origin, record = entry
+        if QUOTE_CACHE_SOFT_TTL <= 0 or time.time() - fetched_at < QUOTE_CACHE_SOFT_TTL:
+            quote_cache_events.inc("hit")
+            return record, origin
+        quote_cache_events.inc("stale")
+        swr_stats["stale_served"] += 1
+        _schedule_revalidation(req, cache_key)
+        return record, "stale"
+
+    if QUOTE_APPROX_TOLERANCE > 0:
+        record = find_approximate(req)
+        if record is not None:
+            quote_cache_events.inc("approximate")
+            return record, "approximate"
+
+    quote_cache_events.inc("miss")
+    record = await fetch_quote(req)
+    store_quote(req, cache_key, record, "fresh")
+    return record, "miss"
+
+
+def hot_quote_keys() -> List[tuple]:
+    """The configured CACHE_WARM_PAIRS x CACHE_WARM_AMOUNTS plus the most requested keys."""
+    keys = []
+    for pair in CACHE_WARM_PAIRS:
+        from_chain, to_chain, from_token, to_token = pair.split(":")
+        decimals = token_decimals(from_chain, from_token)
+        for amount in CACHE_WARM_AMOUNTS:
+            req = QuoteRequest(
+                fromChain=from_chain,
+                toChain=to_chain,
+                fromToken=from_token,
+                toToken=to_token,
+                fromAmount=str(int(amount * 10**decimals)),
+            )
+            keys.append(quote_cache_key(req))
+    for cache_key, _ in request_counts.most_common(CACHE_WARM_TOP_N):
+        keys.append(cache_key)
+    return list(dict.fromkeys(keys))
+
+
+async def warm_pass() -> None:
+    """Refresh every hot key that would expire before the next pass, spread over the interval."""
+    started = time.perf_counter()
+    deadline = time.time() + CACHE_WARM_INTERVAL_S
+    due = []
+    for cache_key in hot_quote_keys():
+        entry = quote_cache.get(cache_key)
+        if entry is None or entry[0] + QUOTE_CACHE_TTL < deadline:
+            due.append(cache_key)
+    warm_stats["keys"] = len(due)
+    # Leave the last quarter of the interval free so a pass never runs into the next one.
+    spacing = 0.75 * CACHE_WARM_INTERVAL_S / max(len(due), 1)
+    for cache_key in due:
+        await asyncio.sleep(spacing * random.uniform(1 - CACHE_WARM_JITTER, 1 + CACHE_WARM_JITTER))
+        if upstream_breaker.is_open:
+            continue
+        req = quote_request_from_key(cache_key)
         try:
-            async for attempt in AsyncRetrying(
-                reraise=True,
-                stop=stop_after_attempt(3),
-                wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
-                retry=retry_if_exception_type((httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError))
-            ):
-                with attempt:
-                    raw_quote_data = await fetch()
-            quote_cache[cache_key] = raw_quote_data
-        except httpx.HTTPStatusError as err:
-            detail = err.response.text if err.response is not None else str(err)
-            status = err.response.status_code if err.response is not None else 502
-            raise HTTPException(status_code=status, detail=f"LI.FI error: {detail}")
-        except (httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError) as err:
-            raise HTTPException(status_code=504, detail=f"Upstream timeout: {str(err)}")
+            store_quote(req, cache_key, await fetch_quote(req), "fresh")
+            warm_stats["refreshes"] += 1
+        except HTTPException:
+            warm_stats["failures"] += 1
+
+    # Decay request counts so the hot set follows recent traffic and the Counter stays small.
+    for cache_key, count in list(request_counts.items()):
+        if count <= 1:
+            del request_counts[cache_key]
+        else:
+            request_counts[cache_key] = count // 2
+    warm_stats["passes"] += 1
+    warm_stats["last_pass_s"] = time.perf_counter() - started
+
+
+async def run_cache_warmer() -> None:
+    """Startup task: warm immediately, then keep hot quotes fresh every CACHE_WARM_INTERVAL_S."""
+    while True:
+        started = time.monotonic()
+        try:
+            await warm_pass()
         except Exception as err:
-            raise HTTPException(status_code=502, detail=f"Upstream failure: {str(err)}")
+            print(f"⚠️ Cache warmer pass failed: {err}")
+        await asyncio.sleep(max(0.0, CACHE_WARM_INTERVAL_S - (time.monotonic() - started)))
 
-    clean_summary = parse_quote(raw_quote_data)
-    # Offload blocking LLM call to thread executor to avoid blocking event loop
-    ai_response = await asyncio.get_event_loop().run_in_executor(None, chain.invoke, clean_summary)
-    ai_summary = ai_response.content
+
+async def build_quote(req: QuoteRequest, cache_key: tuple) -> QuoteSummary:
+    """Fetch (or reuse) the LI.FI quote for cache_key and summarize it via LLM."""
+    started = time.perf_counter()
+    record, cache_status = await get_quote(req, cache_key)
+    clean_summary = record.summary()
+    summary_key = summary_cache_key(clean_summary)
+    ai_summary = summary_cache.get(summary_key)
+    summary_source = "cache"
+    if ai_summary is not None:
+        summary_cache_stats["hits"] += 1
+    else:
+        summary_cache_stats["misses"] += 1
+        ai_summary, summary_source = await summarize_within_slo(clean_summary, summary_key, started)
 
     return QuoteSummary(
         summary=ai_summary,
@@ -221,5 +1206,350 @@ async def get_lifi_quote(
         time_seconds=clean_summary.get("time_seconds"),
         fees_usd=clean_summary.get("fees_usd"),
         output_usd=clean_summary.get("output_usd"),
+        cache_status=cache_status,
+        summary_source=summary_source,
+    )
+
+
+
+async def summarize_batch(clean_summaries: List[dict]) -> List[object]:
+    """
+    Summarize many routes concurrently. Every call goes through summarize(), so each one holds
+    its own llm_semaphore slot and LLM_TIMEOUT, and a batch never runs more than
+    LLM_MAX_CONCURRENCY calls across all requests. Returns one summary string or exception per
+    input, in order.
+    """
+    return await asyncio.gather(*(summarize(s) for s in clean_summaries), return_exceptions=True)
+
+
+@app.post("/api/v1/quotes", response_model=List[BatchQuoteItem])
+async def get_lifi_quotes(
+    reqs: Annotated[List[QuoteRequest], Body(min_length=1, max_length=BATCH_MAX_ITEMS)],
+):
+    """
+    Batch variant of /api/v1/quote. Duplicate requests are fetched once, LI.FI misses are
+    fetched with at most BATCH_FETCH_CONCURRENCY calls in flight, and all summaries that are
+    not cached are generated concurrently within the LLM concurrency limit. Failures are
+    reported per item.
+    """
+    if async_client is None:
+        raise HTTPException(status_code=503, detail="HTTP client not ready")
+
+    # Dedupe identical requests; each unique cache_key is fetched (or read from cache) once.
+    unique: Dict[tuple, QuoteRequest] = {}
+    for req in reqs:
+        unique.setdefault(quote_cache_key(req), req)
+
+    fetch_slots = asyncio.Semaphore(BATCH_FETCH_CONCURRENCY)
+
+    async def fetch_one(req: QuoteRequest, cache_key: tuple) -> object:
+        async with fetch_slots:
+            try:
+                validate_quote_request(req)
+                record, cache_status = await get_quote(req, cache_key)
+                return {**record.summary(), "cache_status": cache_status}
+            except HTTPException as err:
+                return err
+
+    fetched = await asyncio.gather(*(fetch_one(req, key) for key, req in unique.items()))
+    parsed = dict(zip(unique, fetched))
+
+    # Dedupe summaries against summary_cache and against each other, then batch the rest.
+    summaries: Dict[tuple, object] = {}
+    to_generate: Dict[tuple, dict] = {}
+    for clean_summary in parsed.values():
+        if isinstance(clean_summary, HTTPException):
+            continue
+        summary_key = summary_cache_key(clean_summary)
+        if summary_key in summaries or summary_key in to_generate:
+            continue
+        cached = summary_cache.get(summary_key)
+        if cached is not None:
+            summary_cache_stats["hits"] += 1
+            summaries[summary_key] = cached
+        else:
+            summary_cache_stats["misses"] += 1
+            to_generate[summary_key] = clean_summary
+
+    generated = await summarize_batch(list(to_generate.values()))
+    for summary_key, ai_summary in zip(to_generate, generated):
+        summaries[summary_key] = ai_summary
+        if isinstance(ai_summary, str):
+            summary_cache[summary_key] = ai_summary
+
+    items = []
+    for req in reqs:
+        clean_summary = parsed[quote_cache_key(req)]
+        if isinstance(clean_summary, HTTPException):
+            items.append(BatchQuoteItem(request=req, status_code=clean_summary.status_code, error=clean_summary.detail))
+            continue
+        ai_summary = summaries[summary_cache_key(clean_summary)]
+        if isinstance(ai_summary, HTTPException):
+            items.append(BatchQuoteItem(request=req, status_code=ai_summary.status_code, error=ai_summary.detail))
+        elif isinstance(ai_summary, Exception):
+            items.append(BatchQuoteItem(request=req, status_code=502, error=f"LLM failure: {str(ai_summary)}"))
+        else:
+            record_served(req, clean_summary)
+            items.append(BatchQuoteItem(
+                request=req,
+                quote=QuoteSummary(
+                    summary=ai_summary,
+                    provider=clean_summary.get("provider"),
+                    time_seconds=clean_summary.get("time_seconds"),
+                    fees_usd=clean_summary.get("fees_usd"),
+                    output_usd=clean_summary.get("output_usd"),
+                    cache_status=clean_summary.get("cache_status"),
+                ),
+            ))
+    return items
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+@app.get("/api/v1/quote/stream")
+async def stream_lifi_quote(req: QuoteRequest = Depends(quote_request)):
+    """
+    Server-Sent Events variant of /api/v1/quote. The parsed route numbers are sent as a
+    "quote" event as soon as the LI.FI quote is available, followed by "token" events as the
+    LLM summary streams in and a final "done" event carrying the full summary.
+    """
+    # Fetch before the response starts, so upstream errors keep their HTTP status code.
+    record, cache_status = await get_quote(req, quote_cache_key(req))
+    clean_summary = record.summary()
+
+    record_served(req, clean_summary)
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse("quote", {**clean_summary, "cache_status": cache_status})
+        summary_key = summary_cache_key(clean_summary)
+        ai_summary = summary_cache.get(summary_key)
+        if ai_summary is not None:
+            summary_cache_stats["hits"] += 1
+            yield _sse("token", {"text": ai_summary})
+        else:
+            summary_cache_stats["misses"] += 1
+            parts = []
+            try:
+                async for token in stream_summary(clean_summary):
+                    parts.append(token)
+                    yield _sse("token", {"text": token})
+            except HTTPException as err:
+                yield _sse("error", {"status": err.status_code, "detail": err.detail})
+                return
+            except Exception as err:
+                yield _sse("error", {"status": 502, "detail": f"LLM failure: {str(err)}"})
+                return
+            ai_summary = "".join(parts)
+            summary_cache[summary_key] = ai_summary
+        yield _sse("done", {"summary": ai_summary})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+
+async def fetch_routes(req: QuoteRequest) -> RouteTable:
+    """Fetch every LI.FI route candidate for req and parse it into NumPy columns."""
+    from_chain, to_chain = resolve_chain(req.fromChain), resolve_chain(req.toChain)
+    if from_chain is None or to_chain is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported chain, expected one of {sorted(CHAIN_IDS)}")
+    from_token, to_token = resolve_token(req.fromChain, req.fromToken), resolve_token(req.toChain, req.toToken)
+    body = {
+        "fromChainId": from_chain,
+        "toChainId": to_chain,
+        "fromTokenAddress": from_token.address if from_token else req.fromToken,
+        "toTokenAddress": to_token.address if to_token else req.toToken,
+        "fromAmount": req.fromAmount,
+        "fromAddress": req.fromAddress,
+    }
+
+    async def fetch() -> RouteTable:
+        resp = await upstream_call("POST", "/v1/advanced/routes", content=orjson.dumps(body),
+                                   headers={"Content-Type": "application/json"})
+        with stage_seconds.time("parse"):
+            return parse_routes(orjson.loads(resp.content).get("routes", []))
+
+    return await call_lifi(fetch)
+
+
+@app.get("/api/v1/routes", response_model=RouteComparison)
+async def compare_routes(
+    req: QuoteRequest = Depends(quote_request),
+    strategy: str = Query("balanced", pattern="^(" + "|".join(STRATEGIES) + ")$"),
+    k: int = Query(ROUTES_TOP_K, ge=1, le=ROUTES_MAX_TOP_K),
+    w_output: Optional[float] = Query(None, description="Override the strategy's output_usd weight"),
+    w_fees: Optional[float] = Query(None, description="Override the strategy's fees_usd weight"),
+    w_gas: Optional[float] = Query(None, description="Override the strategy's gas_usd weight"),
+    w_time: Optional[float] = Query(None, description="Override the strategy's time_seconds weight"),
+):
+    """
+    Rank every LI.FI route candidate for a transfer and return the top k. Candidates are
+    scored in one vectorized pass over min-max normalized output, fees, gas and duration,
+    weighted by the chosen strategy (cheapest, fastest or balanced) and any w_* overrides.
+    """
+    cache_key = quote_cache_key(req)
+    table = routes_cache.get(cache_key)
+    if table is None:
+        table = await fetch_routes(req)
+        routes_cache[cache_key] = table
+
+    weights = STRATEGIES[strategy].copy()
+    for i, override in enumerate((w_output, w_fees, w_gas, w_time)):
+        if override is not None:
+            weights[i] = override
+    if not len(table.ids):
+        return RouteComparison(strategy=strategy, weights=dict(zip(METRIC_COLUMNS, weights.tolist())),
+                               candidates=0, routes=[])
+
+    scores = score_routes(table.metrics, weights)
+    ranked = []
+    for rank, i in enumerate(top_k(scores, k).tolist(), start=1):
+        output_usd, fees_usd, gas_usd, time_seconds = table.metrics[i].tolist()
+        ranked.append(RouteCandidate(
+            rank=rank,
+            id=table.ids[i],
+            providers=table.providers[i],
+            output_usd=round(output_usd, 2),
+            fees_usd=round(fees_usd, 2),
+            gas_usd=round(gas_usd, 2),
+            time_seconds=int(time_seconds),
+            score=round(float(scores[i]), 4),
+        ))
+    return RouteComparison(
+        strategy=strategy,
+        weights=dict(zip(METRIC_COLUMNS, weights.tolist())),
+        candidates=len(table.ids),
+        routes=ranked,
+    )
+
+
+async def refresh_token_index() -> None:
+    """Reload the snapshot if another worker refreshed it recently, else rebuild it from LI.FI."""
+    age = token_index.snapshot_age()
+    if age is not None and age < TOKEN_INDEX_REFRESH_S:
+        if token_index.loaded_at < time.time() - age:
+            token_index.load()
+        return
+    started = time.perf_counter()
+    chains_resp, tokens_resp = await asyncio.gather(async_client.get("/v1/chains"), async_client.get("/v1/tokens"))
+    chains_resp.raise_for_status()
+    tokens_resp.raise_for_status()
+    chains = orjson.loads(chains_resp.content).get("chains", [])
+    tokens = orjson.loads(tokens_resp.content).get("tokens", {})
+    await asyncio.to_thread(token_index.save, chains, tokens)
+    token_index_stats["refreshes"] += 1
+    token_index_stats["last_refresh_s"] = time.perf_counter() - started
+
+
+async def run_token_index_refresher() -> None:
+    while True:
+        try:
+            await refresh_token_index()
+        except Exception as err:
+            token_index_stats["failures"] += 1
+            print(f"⚠️ Token index refresh failed: {err}")
+        # Retry sooner while there is no index at all.
+        await asyncio.sleep(TOKEN_INDEX_REFRESH_S if token_index.ready else min(TOKEN_INDEX_REFRESH_S, 60))
+
+
+@app.get("/api/v1/tokens/{chain}/{token}", response_model=TokenMetadata)
+async def get_token_metadata(chain: str, token: str):
+    """Chain id, address and decimals of a token, from the local token index (no LI.FI call)."""
+    info = resolve_token(chain, token)
+    if info is not None:
+        return TokenMetadata(
+            chain=chain, chainId=info.chain_id, symbol=info.symbol, address=info.address, decimals=info.decimals
+        )
+    if not token_index.ready and token.upper() in TOKEN_DECIMALS:
+        return TokenMetadata(
+            chain=chain, chainId=resolve_chain(chain), symbol=token.upper(), decimals=TOKEN_DECIMALS[token.upper()]
+        )
+    raise HTTPException(status_code=404, detail=f"Unknown token {token} on {chain}")
+
+
+@app.get("/api/v1/stats")
+async def quote_stats() -> dict:
+    """
+    Rollups of served quotes over the last 1m, 1h and 24h: totals, [count, volume_usd] per
+    chain, token and provider, a per-bucket series and the most recent quotes. Backs the
+    dashboard; see /api/v1/cache/stats for cache and pipeline internals.
+    """
+    return quote_rollups.snapshot()
+
+
+@app.get("/api/v1/cache/stats")
+async def cache_stats() -> dict:
+    """Cache and request-coalescing counters, useful for tuning cache sizes and TTLs."""
+    return {
+        "quote_cache": {
+            "backend": QUOTE_CACHE_BACKEND,
+            "size": len(quote_cache),
+            "maxsize": quote_cache.maxsize,
+            "busy_skips": quote_cache.busy_skips,
+        },
+        "summary_cache": {
+            "size": len(summary_cache),
+            "maxsize": summary_cache.maxsize,
+            "hits": summary_cache_stats["hits"],
+            "misses": summary_cache_stats["misses"],
+        },
+        "routes_cache": {"size": len(routes_cache), "maxsize": routes_cache.maxsize},
+        "llm": {
+            "limit": LLM_MAX_CONCURRENCY,
+            "in_flight": llm_stats["in_flight"],
+            "waiting": llm_stats["waiting"],
+            "calls": llm_stats["calls"],
+            "timeouts": llm_stats["timeouts"],
+            "queue_wait_avg_ms": 1000 * llm_stats["queue_wait_total_s"] / max(llm_stats["calls"], 1),
+            "queue_wait_max_ms": 1000 * llm_stats["queue_wait_max_s"],
+        },
+        "latency_slo": {
+            "budget_s": QUOTE_LATENCY_BUDGET_S,
+            "llm_p95_slo_s": LLM_SLO_P95_S,
+            "llm_p95_s": llm_latency.percentile(95),
+            "degraded": sum(summary_degraded.values.values()),
+            "backfilled": summary_backfills.values[()],
+            "backfills_pending": len(backfilling),
+            "backfills_dropped": summary_backfills_dropped.values[()],
+        },
+        "stale_while_revalidate": {
+            "soft_ttl": QUOTE_CACHE_SOFT_TTL,
+            "revalidating": len(revalidating),
+            **swr_stats,
+        },
+        "upstream": {
+            "breaker_state": upstream_breaker.state,
+            "breaker_times_opened": upstream_breaker.times_opened,
+            "concurrency_limit": round(upstream_limiter.limit, 2),
+            "in_flight": upstream_limiter.in_flight,
+            "rejected": upstream_limiter.rejected,
+        },
+        "journal": quote_journal.stats(),
+        "traffic": {
+            "recording": traffic_recorder.stats() if TRAFFIC_RECORD_DIR else None,
+            "replay": replay_store.stats() if replay_store is not None else None,
+        },
+        "token_index": {
+            "ready": token_index.ready,
+            "token_keys": len(token_index),
+            "snapshot_age_s": token_index.snapshot_age(),
+            **token_index_stats,
+        },
+        "warmer": {"enabled": CACHE_WARM, "interval_s": CACHE_WARM_INTERVAL_S, **warm_stats},
+        "inflight": len(inflight_quotes),
+        "coalesced": coalesce_stats["coalesced"],
+    }
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus text-format metrics: per-stage latency histograms and pipeline counters."""
+    quote_cache_events.values[("eviction",)] = quote_cache.evictions
+    upstream_breaker_state.set({"closed": 0, "half_open": 1, "open": 2}[upstream_breaker.state])
+    upstream_limit.set(upstream_limiter.limit)
+    upstream_in_flight.set(upstream_limiter.in_flight)
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,122 @@
+"""
+Record and replay of upstream HTTP traffic (LI.FI and OpenAI), for reproducing performance
+issues offline.
+
+Both upstreams are reached through httpx clients, so recording and replay are transport swaps:
+
+- RecordingTransport wraps the real transport and appends every request/response pair, with
+  its latency, to a journal (see journal.py) of zstd-compressed JSONL segments. Request headers
+  (API keys) are not recorded.
+- ReplayTransport answers from a ReplayStore loaded from those segments, after sleeping for the
+  recorded latency times latency_scale. Requests are matched on upstream, method, path, sorted
+  query and a hash of the body; repeated requests cycle through their recorded responses, and
+  a request that was never recorded gets 502.
+"""
+import asyncio
+import base64
+import hashlib
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, Optional
+
+import httpx
+
+from journal import QuoteJournal, read_journal
+
+# Response headers kept in recordings; the body is stored exactly as received.
+RECORDED_HEADERS = ("content-type", "content-encoding")
+
+
+def request_key(upstream: str, method: str, url: httpx.URL, body: bytes) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in url.params.multi_items()))
+    digest = hashlib.sha1(body).hexdigest() if body else ""
+    return f"{upstream} {method} {url.path}?{query} {digest}"
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, journal: QuoteJournal, upstream: str):
+        self.transport = transport
+        self.journal = journal
+        self.upstream = upstream
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        latency_s = time.perf_counter() - started
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        await self.journal.append({
+            "ts": time.time(),
+            "upstream": self.upstream,
+            "key": request_key(self.upstream, request.method, request.url, body),
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": headers,
+            "body": base64.b64encode(content).decode(),
+            "latency_s": round(latency_s, 6),
+        })
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=content,
+            extensions=response.extensions,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayStore:
+    def __init__(self, entries: Iterable[dict] = ()):
+        self.responses: Dict[str, Deque[dict]] = defaultdict(deque)
+        self.hits = 0
+        self.misses = 0
+        for entry in entries:
+            self.responses[entry["key"]].append(entry)
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayStore":
+        """Load every recording in a segment file or directory of segments."""
+        return cls(read_journal(path))
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self.responses.values())
+
+    def take(self, key: str) -> Optional[dict]:
+        responses = self.responses.get(key)
+        if not responses:
+            self.misses += 1
+            return None
+        self.hits += 1
+        responses.rotate(-1)
+        return responses[-1]
+
+    def stats(self) -> dict:
+        return {"recordings": len(self), "requests": len(self.responses), "hits": self.hits, "misses": self.misses}
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, store: ReplayStore, upstream: str, latency_scale: float = 1.0):
+        self.store = store
+        self.upstream = upstream
+        self.latency_scale = latency_scale
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        key = request_key(self.upstream, request.method, request.url, body)
+        entry = self.store.take(key)
+        if entry is None:
+            return httpx.Response(502, text=f"no recording for {key}", request=request)
+        if self.latency_scale:
+            await asyncio.sleep(entry["latency_s"] * self.latency_scale)
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=base64.b64decode(entry["body"]),
+            request=request,
+        )
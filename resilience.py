@@ -0,0 +1,252 @@
+"""
+Upstream protection for the LI.FI fetch path: a circuit breaker that fails fast while
+li.quest is unhealthy, an AIMD (additive-increase, multiplicative-decrease) limit on
+concurrent upstream calls, and a budgeted hedger for cutting tail latency. LatencyWindow
+tracks recent LLM latency for the summary SLO.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when no upstream slot frees up within the queue timeout."""
+
+
+class CircuitBreaker:
+    """
+    Counts the outcomes of the last `window` calls. Once at least `min_calls` were seen
+    and the share of failures (errors or calls slower than `slow_call_s`) reaches
+    `failure_rate`, the breaker opens for `open_s` seconds. It then lets up to `probes`
+    calls through (half-open); if they all succeed it closes, any failure reopens it.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_s: float = 5.0,
+        open_s: float = 15.0,
+        probes: int = 2,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_s = slow_call_s
+        self.open_s = open_s
+        self.probes = probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go upstream now."""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_s - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(remaining)
+            self.state = HALF_OPEN
+            self._probes_started = self._probes_succeeded = 0
+        if self.state == HALF_OPEN:
+            if self._probes_started >= self.probes:
+                raise CircuitOpenError(self.open_s)
+            self._probes_started += 1
+
+    def record(self, ok: bool, latency: float) -> None:
+        failed = not ok or latency > self.slow_call_s
+        if self.state == HALF_OPEN:
+            if failed:
+                self._open()
+            else:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.probes:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+            return
+        self._outcomes.append(failed)
+        if (
+            self.state == CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open()
+
+    def abandon(self) -> None:
+        """The call allowed by before_call() never completed (e.g. it was cancelled)."""
+        if self.state == HALF_OPEN and self._probes_started > 0:
+            self._probes_started -= 1
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._outcomes.clear()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() < self.opened_at + self.open_s
+
+
+class AdaptiveLimiter:
+    """
+    Limits concurrent upstream calls. Each fast, successful call raises the limit by
+    1/limit (about +1 per limit's worth of calls); each failure or call slower than
+    `latency_target_s` multiplies it by `backoff`. Callers over the limit queue for up
+    to `queue_timeout_s` and then get ConcurrencyLimitExceeded.
+    """
+
+    def __init__(
+        self,
+        initial: float = 20,
+        min_limit: int = 2,
+        max_limit: int = 100,
+        latency_target_s: float = 2.0,
+        backoff: float = 0.9,
+        queue_timeout_s: float = 2.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_s = latency_target_s
+        self.backoff = backoff
+        self.queue_timeout_s = queue_timeout_s
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands the slot over by bumping in_flight before resolving the waiter.
+            await asyncio.wait_for(waiter, self.queue_timeout_s if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ConcurrencyLimitExceeded(f"upstream concurrency limit {int(self.limit)} reached")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on.
+                self.release_unused()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def release(self, ok: bool, latency: float) -> None:
+        self.in_flight -= 1
+        if ok and latency <= self.latency_target_s:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        self._wake()
+
+    def release_unused(self) -> None:
+        """Give back a slot without a call outcome, leaving the limit unchanged."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+
+class Hedger:
+    """
+    Decides when to send a second, identical upstream request. The hedge delay is the
+    `percentile` of the last `window` successful call latencies (no hedging until
+    `min_samples` were seen). Each primary call earns `budget` tokens and each hedge spends
+    one, so hedges add at most about budget * 100% extra upstream load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay_s: float = 0.01,
+        max_tokens: float = 10.0,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay_s = min_delay_s
+        self.max_tokens = max_tokens
+        self.tokens = 0.0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._delay: Optional[float] = None
+        self._since_recompute = 0
+
+    def observe(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._since_recompute += 1
+        # Re-sorting the window on every call is wasteful; refresh the estimate every 10 samples.
+        if self._since_recompute >= 10 or self._delay is None:
+            self._since_recompute = 0
+            if len(self._latencies) >= self.min_samples:
+                ordered = sorted(self._latencies)
+                index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+                self._delay = max(self.min_delay_s, ordered[index])
+
+    def delay(self) -> Optional[float]:
+        """Hedge delay for a new primary call, or None while there are too few samples."""
+        self.tokens = min(self.max_tokens, self.tokens + self.budget)
+        return self._delay
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class LatencyWindow:
+    """
+    Latencies observed during the last `window_s` seconds (at most `maxlen` of them). Old
+    samples age out, so a percentile over the window recovers once calls are fast again or
+    stop being made.
+    """
+
+    def __init__(self, window_s: float = 60.0, maxlen: int = 500):
+        self.window_s = window_s
+        self._samples: Deque[tuple] = deque(maxlen=maxlen)
+
+    def observe(self, latency: float) -> None:
+        self._samples.append((time.monotonic(), latency))
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """The given percentile of the window, or None if it holds no samples."""
+        cutoff = time.monotonic() - self.window_s
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        if not self._samples:
+            return None
+        ordered = sorted(latency for _, latency in self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
@@ -0,0 +1,119 @@
+"""
+In-memory rollups of served quotes for the dashboard (/api/v1/stats).
+
+Each Rollup is a ring buffer of fixed time buckets covering a sliding window. A bucket maps
+"dimension:value" keys (plus "total") to [count, USD volume, summed route seconds]; a bucket is
+reset when the ring wraps onto it. Recording a quote touches a constant number of dict cells,
+and memory is bounded by buckets x max_keys regardless of traffic.
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+TOTAL = "total"
+DIMENSIONS = ("chain", "token", "provider")
+
+
+class Rollup:
+    def __init__(self, window_s: float, buckets: int, max_keys: int = 256):
+        self.window_s = window_s
+        self.bucket_s = window_s / buckets
+        self.max_keys = max_keys
+        self._slots: List[Dict[str, list]] = [{} for _ in range(buckets)]
+        self._epochs: List[int] = [-1] * buckets
+
+    def add(self, keys: tuple, volume_usd: float, seconds: float, now: float) -> None:
+        epoch = int(now // self.bucket_s)
+        i = epoch % len(self._slots)
+        if self._epochs[i] != epoch:
+            self._slots[i] = {}
+            self._epochs[i] = epoch
+        slot = self._slots[i]
+        for key in keys:
+            cell = slot.get(key)
+            if cell is None:
+                if len(slot) >= self.max_keys:
+                    # Too many distinct values in this bucket: fold the rest into "<dimension>:other".
+                    key = key.split(":", 1)[0] + ":other"
+                    cell = slot.get(key)
+                if cell is None:
+                    cell = slot[key] = [0, 0.0, 0.0]
+            cell[0] += 1
+            cell[1] += volume_usd
+            cell[2] += seconds
+
+    def _live(self, now: float):
+        """(bucket start time, bucket) pairs inside the window, oldest first."""
+        current = int(now // self.bucket_s)
+        for epoch in range(current - len(self._slots) + 1, current + 1):
+            i = epoch % len(self._slots)
+            yield epoch * self.bucket_s, self._slots[i] if self._epochs[i] == epoch else {}
+
+    def totals(self, now: float) -> Dict[str, list]:
+        result: Dict[str, list] = {}
+        for _, slot in self._live(now):
+            for key, (count, volume, seconds) in slot.items():
+                cell = result.setdefault(key, [0, 0.0, 0.0])
+                cell[0] += count
+                cell[1] += volume
+                cell[2] += seconds
+        return result
+
+    def series(self, now: float) -> List[list]:
+        """[bucket start, count, USD volume] of every bucket in the window, oldest first."""
+        series = []
+        for start, slot in self._live(now):
+            count, volume, _ = slot.get(TOTAL, (0, 0.0, 0.0))
+            series.append([start, count, round(volume, 2)])
+        return series
+
+
+class QuoteRollups:
+    """Served-quote rollups over 1m, 1h and 24h windows, plus the most recent quotes."""
+
+    def __init__(self, max_keys: int = 256, recent: int = 20):
+        self.windows = {
+            "1m": Rollup(60, 12, max_keys),
+            "1h": Rollup(3600, 60, max_keys),
+            "24h": Rollup(86400, 96, max_keys),
+        }
+        self.recent: Deque[list] = deque(maxlen=recent)
+
+    def record(
+        self,
+        chain: str,
+        token: str,
+        provider: str,
+        volume_usd: float,
+        seconds: float,
+        now: Optional[float] = None,
+    ) -> None:
+        now = time.time() if now is None else now
+        keys = (TOTAL, f"chain:{chain}", f"token:{token}", f"provider:{provider}")
+        for rollup in self.windows.values():
+            rollup.add(keys, volume_usd, seconds, now)
+        self.recent.append([now, chain, token, provider, round(volume_usd, 2)])
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        """
+        Per window: count, volume_usd and avg_time_seconds overall, [count, volume_usd] per
+        chain/token/provider, and the per-bucket series. Recent quotes are
+        [time, chain, token, provider, volume_usd], newest last.
+        """
+        now = time.time() if now is None else now
+        windows = {}
+        for name, rollup in self.windows.items():
+            totals = rollup.totals(now)
+            count, volume, seconds = totals.pop(TOTAL, (0, 0.0, 0.0))
+            window = {
+                "count": count,
+                "volume_usd": round(volume, 2),
+                "avg_time_seconds": round(seconds / count, 1) if count else None,
+                **{dimension: {} for dimension in DIMENSIONS},
+            }
+            for key, (key_count, key_volume, _) in totals.items():
+                dimension, value = key.split(":", 1)
+                window[dimension][value] = [key_count, round(key_volume, 2)]
+            window["series"] = rollup.series(now)
+            windows[name] = window
+        return {"generated_at": now, "windows": windows, "recent": list(self.recent)}
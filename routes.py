@@ -0,0 +1,70 @@
+"""
+Vectorized parsing and ranking of LI.FI advanced routes.
+
+parse_routes() turns the /v1/advanced/routes candidates into a RouteTable of NumPy columns,
+score_routes() scores every candidate in one matrix-vector product, and top_k() picks the best
+k without sorting the whole table.
+"""
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+# Column order of RouteTable.metrics and of every weight vector.
+METRIC_COLUMNS = ("output_usd", "fees_usd", "gas_usd", "time_seconds")
+
+# Positive weights reward a column, negative weights penalize it. Columns are min-max
+# normalized across the candidates first, so weights are comparable between columns.
+STRATEGIES: Dict[str, np.ndarray] = {
+    "cheapest": np.array([1.0, -0.5, -0.5, 0.0]),
+    "fastest": np.array([0.2, -0.1, -0.1, -1.0]),
+    "balanced": np.array([0.6, -0.3, -0.3, -0.4]),
+}
+
+
+class RouteTable(NamedTuple):
+    ids: List[str]
+    providers: List[str]
+    metrics: np.ndarray  # shape (n_routes, len(METRIC_COLUMNS)), float64
+
+
+def _usd_sum(costs: list) -> float:
+    return sum(float(c.get("amountUSD") or 0) for c in costs)
+
+
+def parse_routes(routes: List[dict]) -> RouteTable:
+    """Extract output, fees, gas and duration for every candidate route."""
+    n = len(routes)
+    metrics = np.zeros((n, len(METRIC_COLUMNS)))
+    ids: List[str] = []
+    providers: List[str] = []
+    for i, route in enumerate(routes):
+        steps = route.get("steps", [])
+        fees = gas = duration = 0.0
+        for step in steps:
+            estimate = step.get("estimate", {})
+            fees += _usd_sum(estimate.get("feeCosts", []))
+            gas += _usd_sum(estimate.get("gasCosts", []))
+            duration += estimate.get("executionDuration", 0)
+        if route.get("gasCostUSD") is not None:
+            gas = float(route["gasCostUSD"])
+        metrics[i] = (float(route.get("toAmountUSD") or 0), fees, gas, duration)
+        ids.append(route.get("id", str(i)))
+        providers.append(" → ".join(step.get("toolDetails", {}).get("name", "N/A") for step in steps) or "N/A")
+    return RouteTable(ids, providers, metrics)
+
+
+def score_routes(metrics: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Min-max normalize each column across candidates and return metrics @ weights."""
+    low = metrics.min(axis=0)
+    span = metrics.max(axis=0) - low
+    span[span == 0] = 1.0  # a constant column contributes nothing
+    return ((metrics - low) / span) @ weights
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]